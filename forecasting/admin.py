@@ -1,5 +1,9 @@
+from decimal import Decimal
+
 from django.contrib import admin
+from django.db.models import Count, Sum
 from .models import Site, Portfolio, PortfolioSite, ForecastJob, ForecastResult
+from .paginators import EstimatedCountPaginator
 
 
 @admin.register(Site)
@@ -15,6 +19,9 @@ class PortfolioSiteInline(admin.TabularInline):
     model = PortfolioSite
     extra = 0
     readonly_fields = ['added_at']
+    
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('portfolio', 'site')
 
 
 @admin.register(Portfolio)
@@ -25,12 +32,19 @@ class PortfolioAdmin(admin.ModelAdmin):
     readonly_fields = ['created_at', 'updated_at']
     inlines = [PortfolioSiteInline]
     
+    def get_queryset(self, request):
+        # Annotate site totals so the changelist doesn't query per portfolio row
+        return super().get_queryset(request).annotate(
+            _site_count=Count('sites'),
+            _total_capacity=Sum('sites__capacity_mw')
+        )
+    
     def get_site_count(self, obj):
-        return obj.get_site_count()
+        return obj._site_count
     get_site_count.short_description = 'Sites Count'
     
     def get_total_capacity(self, obj):
-        return f"{obj.get_total_capacity()} MW"
+        return f"{obj._total_capacity or Decimal('0.00')} MW"
     get_total_capacity.short_description = 'Total Capacity'
 
 
@@ -41,6 +55,9 @@ class ForecastJobAdmin(admin.ModelAdmin):
     search_fields = ['portfolio__name']
     ordering = ['-created_at']
     readonly_fields = ['id', 'created_at', 'completed_at']
+    list_select_related = ['portfolio']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
 
 @admin.register(ForecastResult)
@@ -50,3 +67,7 @@ class ForecastResultAdmin(admin.ModelAdmin):
     search_fields = ['job__id', 'site__name']
     ordering = ['forecast_datetime']
     readonly_fields = ['created_at']
+    # ForecastJob.__str__ renders the portfolio name, so follow job -> portfolio too
+    list_select_related = ['job__portfolio', 'site']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
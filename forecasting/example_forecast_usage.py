@@ -15,7 +15,9 @@ from decimal import Decimal
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'renewable_forecasting.settings')
 django.setup()
 
-from forecasting.models import Site, Portfolio
+from django.db.models import Count, Sum
+
+from forecasting.models import Site, Portfolio, PortfolioSite
 from forecasting.services import ForecastService
 
 
@@ -29,39 +31,37 @@ def main():
     # Step 1: Create some example sites
     print("1. Creating renewable energy sites...")
     
-    # Create solar sites
-    solar_site1 = Site.objects.create(
-        name="California Solar Farm",
-        site_type="solar",
-        latitude=Decimal('36.7783'),
-        longitude=Decimal('-119.4179'),
-        capacity_mw=Decimal('100.0')
-    )
-    
-    solar_site2 = Site.objects.create(
-        name="Arizona Solar Plant",
-        site_type="solar",
-        latitude=Decimal('33.4484'),
-        longitude=Decimal('-112.0740'),
-        capacity_mw=Decimal('150.0')
-    )
-    
-    # Create wind sites
-    wind_site1 = Site.objects.create(
-        name="Texas Wind Farm",
-        site_type="wind",
-        latitude=Decimal('32.7767'),
-        longitude=Decimal('-96.7970'),
-        capacity_mw=Decimal('200.0')
-    )
-    
-    wind_site2 = Site.objects.create(
-        name="Kansas Wind Plant",
-        site_type="wind",
-        latitude=Decimal('39.0119'),
-        longitude=Decimal('-98.4842'),
-        capacity_mw=Decimal('175.0')
-    )
+    # Create solar and wind sites in a single INSERT
+    solar_site1, solar_site2, wind_site1, wind_site2 = Site.objects.bulk_create([
+        Site(
+            name="California Solar Farm",
+            site_type="solar",
+            latitude=Decimal('36.7783'),
+            longitude=Decimal('-119.4179'),
+            capacity_mw=Decimal('100.0')
+        ),
+        Site(
+            name="Arizona Solar Plant",
+            site_type="solar",
+            latitude=Decimal('33.4484'),
+            longitude=Decimal('-112.0740'),
+            capacity_mw=Decimal('150.0')
+        ),
+        Site(
+            name="Texas Wind Farm",
+            site_type="wind",
+            latitude=Decimal('32.7767'),
+            longitude=Decimal('-96.7970'),
+            capacity_mw=Decimal('200.0')
+        ),
+        Site(
+            name="Kansas Wind Plant",
+            site_type="wind",
+            latitude=Decimal('39.0119'),
+            longitude=Decimal('-98.4842'),
+            capacity_mw=Decimal('175.0')
+        ),
+    ])
     
     print(f"   ✓ Created {Site.objects.count()} sites:")
     for site in Site.objects.all():
@@ -70,31 +70,39 @@ def main():
     # Step 2: Create portfolios
     print("\n2. Creating portfolios...")
     
-    # Solar portfolio
-    solar_portfolio = Portfolio.objects.create(
-        name="Solar Portfolio",
-        description="Portfolio of solar energy sites"
-    )
-    solar_portfolio.sites.add(solar_site1, solar_site2)
-    
-    # Wind portfolio
-    wind_portfolio = Portfolio.objects.create(
-        name="Wind Portfolio", 
-        description="Portfolio of wind energy sites"
-    )
-    wind_portfolio.sites.add(wind_site1, wind_site2)
-    
-    # Mixed portfolio
-    mixed_portfolio = Portfolio.objects.create(
-        name="Mixed Renewable Portfolio",
-        description="Portfolio with both solar and wind sites"
-    )
-    mixed_portfolio.sites.add(solar_site1, wind_site1)
-    
-    print(f"   ✓ Created {Portfolio.objects.count()} portfolios:")
-    for portfolio in Portfolio.objects.all():
-        print(f"     - {portfolio.name}: {portfolio.get_site_count()} sites, "
-              f"{portfolio.get_total_capacity()}MW total capacity")
+    solar_portfolio, wind_portfolio, mixed_portfolio = Portfolio.objects.bulk_create([
+        Portfolio(
+            name="Solar Portfolio",
+            description="Portfolio of solar energy sites"
+        ),
+        Portfolio(
+            name="Wind Portfolio",
+            description="Portfolio of wind energy sites"
+        ),
+        Portfolio(
+            name="Mixed Renewable Portfolio",
+            description="Portfolio with both solar and wind sites"
+        ),
+    ])
+    
+    # Link every portfolio to its sites with one INSERT into the through table
+    PortfolioSite.objects.bulk_create([
+        PortfolioSite(portfolio=solar_portfolio, site=solar_site1),
+        PortfolioSite(portfolio=solar_portfolio, site=solar_site2),
+        PortfolioSite(portfolio=wind_portfolio, site=wind_site1),
+        PortfolioSite(portfolio=wind_portfolio, site=wind_site2),
+        PortfolioSite(portfolio=mixed_portfolio, site=solar_site1),
+        PortfolioSite(portfolio=mixed_portfolio, site=wind_site1),
+    ])
+    
+    portfolios = Portfolio.objects.annotate(
+        site_count=Count('sites'),
+        total_capacity=Sum('sites__capacity_mw')
+    ).order_by('name')
+    print(f"   ✓ Created {len(portfolios)} portfolios:")
+    for portfolio in portfolios:
+        print(f"     - {portfolio.name}: {portfolio.site_count} sites, "
+              f"{portfolio.total_capacity or Decimal('0.00')}MW total capacity")
     
     # Step 3: Trigger forecasts
     print("\n3. Triggering forecasts...")
@@ -27,7 +27,7 @@ from forecasting.forecast_engine import (
 class ExampleAdvancedModel(ForecastModel):
     """Example of a more advanced forecasting model."""
     
-    def predict(self, site, forecast_horizon: int = 24):
+    def predict(self, site, forecast_horizon: int = 24, start_time=None):
         """Generate predictions using a more sophisticated approach."""
         from forecasting.forecast_engine import ForecastPoint
         from django.utils import timezone
@@ -36,7 +36,8 @@ class ExampleAdvancedModel(ForecastModel):
         # This is just an example - in reality this might use weather data,
         # machine learning models, etc.
         base_capacity = site.capacity_mw or Decimal('10.0')
-        start_time = timezone.now().replace(minute=0, second=0, microsecond=0)
+        if start_time is None:
+            start_time = timezone.now().replace(minute=0, second=0, microsecond=0)
         
         predictions = []
         for hour in range(forecast_horizon):
@@ -5,11 +5,13 @@ This module provides a pluggable architecture for different forecasting models
 that can be easily integrated for different site types.
 """
 
+import math
 import random
 from abc import ABC, abstractmethod
 from datetime import datetime, timedelta
 from decimal import Decimal
-from typing import List, NamedTuple, Optional
+from functools import lru_cache
+from typing import List, NamedTuple, Optional, Sequence, Tuple
 try:
     from django.utils import timezone
 except ImportError:
@@ -21,6 +23,30 @@ except ImportError:
             return datetime.datetime.now()
 
 
+# Solar diurnal pattern by hour of day: a sine bell peaking at noon over the
+# 6 AM - 6 PM daylight window, zero at night
+_SOLAR_DIURNAL = tuple(
+    math.sin(math.pi * (hour - 6) / 12) if 6 <= hour <= 18 else 0.0
+    for hour in range(24)
+)
+
+
+@lru_cache(maxsize=32)
+def _forecast_hours(start_time: datetime, forecast_horizon: int) -> Tuple[datetime, ...]:
+    """
+    Return the hourly timestamps of a forecast horizon.
+    
+    Every site in a forecast job shares the same start hour and horizon, so
+    the timestamps are built once per job rather than once per site.
+    """
+    return tuple(start_time + timedelta(hours=hour) for hour in range(forecast_horizon))
+
+
+def _to_mwh(value: float) -> Decimal:
+    """Quantize a float MWh value to the 0.001 MWh precision stored for forecasts."""
+    return Decimal(f"{max(0.0, value):.3f}")
+
+
 class ForecastPoint(NamedTuple):
     """Represents a single forecast data point."""
     datetime: datetime
@@ -32,14 +58,23 @@ class ForecastPoint(NamedTuple):
 class ForecastModel(ABC):
     """Abstract base class for all forecasting models."""
     
+    # Set to True when predict() output depends only on the site, horizon and
+    # start time; the forecast service then reuses earlier predictions for the
+    # same inputs. Bump the name returned by get_model_name() on model changes.
+    deterministic = False
+    
     @abstractmethod
-    def predict(self, site, forecast_horizon: int = 24) -> List[ForecastPoint]:
+    def predict(self, site, forecast_horizon: int = 24,
+                start_time: Optional[datetime] = None) -> List[ForecastPoint]:
         """
         Generate forecast predictions for a given site.
         
         Args:
             site: Site model instance to forecast for
             forecast_horizon: Number of hours to forecast (default: 24)
+            start_time: Datetime of the first forecast hour (default: the
+                current hour). Callers forecasting several sites together pass
+                one shared value so all sites line up on the same hours.
             
         Returns:
             List of ForecastPoint objects containing predictions
@@ -73,13 +108,16 @@ class RandomForecastModel(ForecastModel):
         """
         self._random = random.Random(seed)
     
-    def predict(self, site, forecast_horizon: int = 24) -> List[ForecastPoint]:
+    def predict(self, site, forecast_horizon: int = 24,
+                start_time: Optional[datetime] = None) -> List[ForecastPoint]:
         """
         Generate random forecast predictions with realistic patterns.
         
         Args:
             site: Site model instance to forecast for
             forecast_horizon: Number of hours to forecast (default: 24)
+            start_time: Datetime of the first forecast hour (default: the
+                current hour)
             
         Returns:
             List of ForecastPoint objects with random but realistic predictions
@@ -90,99 +128,82 @@ class RandomForecastModel(ForecastModel):
         if forecast_horizon <= 0:
             raise ValueError("Forecast horizon must be positive")
         
-        # Get base capacity for the site
-        base_capacity = site.capacity_mw or Decimal('10.0')  # Default 10MW if not specified
+        # Work in float internally; values are only converted to Decimal at the
+        # ForecastPoint boundary
+        base_capacity = float(site.capacity_mw or 10.0)  # Default 10MW if not specified
         
-        # Generate forecast points
-        forecast_points = []
-        start_time = timezone.now().replace(minute=0, second=0, microsecond=0)
+        # Build the whole horizon up front so each site type is generated in one batch
+        if start_time is None:
+            start_time = timezone.now().replace(minute=0, second=0, microsecond=0)
+        timestamps = _forecast_hours(start_time, forecast_horizon)
         
-        for hour in range(forecast_horizon):
-            forecast_datetime = start_time + timedelta(hours=hour)
-            
-            # Generate prediction based on site type
-            if site.site_type == 'solar':
-                predicted_mwh = self._generate_solar_prediction(
-                    base_capacity, forecast_datetime, hour
-                )
-            elif site.site_type == 'wind':
-                predicted_mwh = self._generate_wind_prediction(
-                    base_capacity, forecast_datetime, hour
-                )
-            else:
-                # Fallback for unknown site types
-                predicted_mwh = self._generate_generic_prediction(base_capacity)
-            
-            # Generate confidence intervals (±20% of prediction)
-            confidence_range = predicted_mwh * Decimal('0.2')
-            lower_bound = max(Decimal('0.0'), predicted_mwh - confidence_range)
-            upper_bound = predicted_mwh + confidence_range
-            
-            forecast_points.append(ForecastPoint(
-                datetime=forecast_datetime,
-                predicted_generation_mwh=predicted_mwh,
-                confidence_interval_lower=lower_bound,
-                confidence_interval_upper=upper_bound
-            ))
+        # Generate predictions based on site type
+        if site.site_type == 'solar':
+            predictions = self._generate_solar_predictions(base_capacity, timestamps)
+        elif site.site_type == 'wind':
+            predictions = self._generate_wind_predictions(base_capacity, timestamps)
+        else:
+            # Fallback for unknown site types
+            predictions = self._generate_generic_predictions(base_capacity, len(timestamps))
         
-        return forecast_points
+        # Confidence intervals are ±20% of the prediction
+        return [
+            ForecastPoint(
+                datetime=forecast_datetime,
+                predicted_generation_mwh=_to_mwh(predicted_mwh),
+                confidence_interval_lower=_to_mwh(predicted_mwh * 0.8),
+                confidence_interval_upper=_to_mwh(predicted_mwh * 1.2)
+            )
+            for forecast_datetime, predicted_mwh in zip(timestamps, predictions)
+        ]
     
-    def _generate_solar_prediction(self, base_capacity: Decimal, 
-                                 forecast_datetime: datetime, hour: int) -> Decimal:
-        """Generate solar-specific prediction with diurnal pattern."""
-        # Solar generation follows a bell curve during daylight hours
-        hour_of_day = forecast_datetime.hour
-        
-        # No generation during night hours (roughly 6 PM to 6 AM)
-        if hour_of_day < 6 or hour_of_day > 18:
-            return Decimal('0.0')
-        
-        # Peak generation around noon (12 PM)
-        # Use a simplified sine wave for diurnal pattern
-        import math
-        
-        # Normalize hour to 0-12 range for daylight hours
-        daylight_hour = hour_of_day - 6  # 0-12 range
-        
-        # Generate base pattern (0 to 1)
-        base_pattern = math.sin(math.pi * daylight_hour / 12)
-        
-        # Add some randomness (±30%)
-        random_factor = 1 + (self._random.random() - 0.5) * 0.6
+    def _random_batch(self, size: int) -> List[float]:
+        """Draw ``size`` uniform [0, 1) samples in one call."""
+        rand = self._random.random
+        return [rand() for _ in range(size)]
+    
+    def _generate_solar_predictions(self, base_capacity: float,
+                                    timestamps: Sequence[datetime]) -> List[float]:
+        """Generate solar-specific predictions with diurnal pattern."""
+        # Assume capacity factor of ~25% on average
+        base_output = base_capacity * 0.25
         
-        # Calculate generation (assume capacity factor of ~25% on average)
-        generation = base_capacity * Decimal(str(base_pattern)) * Decimal('0.25') * Decimal(str(random_factor))
+        # Add some randomness (±30%); night hours have a zero pattern, so they
+        # stay at zero generation regardless of the noise
+        noise = self._random_batch(len(timestamps))
         
-        return max(Decimal('0.0'), generation.quantize(Decimal('0.001')))
+        return [
+            base_output * _SOLAR_DIURNAL[forecast_datetime.hour] * (1 + (sample - 0.5) * 0.6)
+            for forecast_datetime, sample in zip(timestamps, noise)
+        ]
     
-    def _generate_wind_prediction(self, base_capacity: Decimal, 
-                                forecast_datetime: datetime, hour: int) -> Decimal:
-        """Generate wind-specific prediction with more variable pattern."""
-        # Wind generation is more variable and can occur at any time
-        
+    def _generate_wind_predictions(self, base_capacity: float,
+                                   timestamps: Sequence[datetime]) -> List[float]:
+        """Generate wind-specific predictions with more variable pattern."""
+        # Wind generation is more variable and can occur at any time.
         # Base capacity factor for wind (typically 25-35%)
-        base_factor = Decimal('0.30')
+        base_output = base_capacity * 0.30
         
         # Add significant randomness for wind variability (±50%)
-        random_factor = 1 + (self._random.random() - 0.5) * 1.0
-        
-        # Slight seasonal adjustment (higher in winter months)
-        month = forecast_datetime.month
-        seasonal_factor = 1.2 if month in [11, 12, 1, 2, 3] else 1.0
+        noise = self._random_batch(len(timestamps))
+        predictions = []
         
-        generation = (base_capacity * base_factor * 
-                     Decimal(str(random_factor)) * 
-                     Decimal(str(seasonal_factor)))
+        for forecast_datetime, sample in zip(timestamps, noise):
+            random_factor = 1 + (sample - 0.5) * 1.0
+            
+            # Slight seasonal adjustment (higher in winter months)
+            seasonal_factor = 1.2 if forecast_datetime.month in (11, 12, 1, 2, 3) else 1.0
+            
+            predictions.append(max(0.0, base_output * random_factor * seasonal_factor))
         
-        return max(Decimal('0.0'), generation.quantize(Decimal('0.001')))
+        return predictions
     
-    def _generate_generic_prediction(self, base_capacity: Decimal) -> Decimal:
-        """Generate generic prediction for unknown site types."""
+    def _generate_generic_predictions(self, base_capacity: float, size: int) -> List[float]:
+        """Generate generic predictions for unknown site types."""
         # Simple random generation with 20% average capacity factor
-        random_factor = self._random.random()
-        generation = base_capacity * Decimal('0.20') * Decimal(str(random_factor))
+        base_output = base_capacity * 0.20
         
-        return max(Decimal('0.0'), generation.quantize(Decimal('0.001')))
+        return [max(0.0, base_output * sample) for sample in self._random_batch(size)]
     
     def get_model_name(self) -> str:
         """Return the name of this model."""
@@ -203,13 +224,19 @@ class ModelRegistry:
     """
     
     def __init__(self):
-        """Initialize the model registry with default models."""
+        """
+        Initialize the model registry with default models.
+        
+        A single RandomForecastModel backs the default and the built-in site
+        types, so they share one random stream; registering a model for a
+        site type overrides it for that type only.
+        """
         self._models = {}
         self._default_model = RandomForecastModel()
         
         # Register default random model for all site types
-        self.register_model('solar', RandomForecastModel())
-        self.register_model('wind', RandomForecastModel())
+        self.register_model('solar', self._default_model)
+        self.register_model('wind', self._default_model)
     
     def register_model(self, site_type: str, model: ForecastModel) -> None:
         """
@@ -234,6 +261,11 @@ class ModelRegistry:
         Returns:
             ForecastModel instance for the site type, or default model if none registered
         """
+        # Keys are stored lowercased, and site types saved through the Site
+        # model already are, so try the exact key before normalizing
+        model = self._models.get(site_type)
+        if model is not None:
+            return model
         return self._models.get(site_type.lower(), self._default_model)
     
     def get_registered_site_types(self) -> List[str]:
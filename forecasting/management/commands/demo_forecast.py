@@ -2,62 +2,83 @@
 Django management command to demonstrate forecast service functionality.
 """
 
+import time
 from decimal import Decimal
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count, Sum
 
 from forecasting.models import Site, Portfolio
 from forecasting.services import ForecastService
 
 
+# Seconds between job status checks while waiting for a forecast
+POLL_INTERVAL_SECONDS = 0.5
+
+
 class Command(BaseCommand):
     help = 'Demonstrate the forecast service functionality'
     
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--wait-timeout',
+            type=float,
+            default=60.0,
+            help='Seconds to wait for the forecast job to finish (default: 60)'
+        )
+    
     def handle(self, *args, **options):
         """Run the forecast service demonstration."""
         self.stdout.write("=== Renewable Energy Forecasting Service Demo ===\n")
         
-        # Clear existing data for clean demo
-        Site.objects.all().delete()
-        Portfolio.objects.all().delete()
-        
         # Initialize the forecast service
         service = ForecastService(forecast_horizon=12)
         
-        # Step 1: Create example sites
-        self.stdout.write("1. Creating renewable energy sites...")
-        
-        solar_site = Site.objects.create(
-            name="Demo Solar Farm",
-            site_type="solar",
-            latitude=Decimal('36.7783'),
-            longitude=Decimal('-119.4179'),
-            capacity_mw=Decimal('100.0')
-        )
-        
-        wind_site = Site.objects.create(
-            name="Demo Wind Farm",
-            site_type="wind",
-            latitude=Decimal('32.7767'),
-            longitude=Decimal('-96.7970'),
-            capacity_mw=Decimal('150.0')
-        )
-        
-        self.stdout.write(f"   ✓ Created {Site.objects.count()} sites:")
-        for site in Site.objects.all():
-            self.stdout.write(f"     - {site.name}: {site.capacity_mw}MW {site.site_type}")
-        
-        # Step 2: Create portfolio
-        self.stdout.write("\n2. Creating portfolio...")
+        # Reset and seed the demo data in a single transaction
+        with transaction.atomic():
+            # Clear existing data for clean demo
+            Site.objects.all().delete()
+            Portfolio.objects.all().delete()
+            
+            # Step 1: Create example sites
+            self.stdout.write("1. Creating renewable energy sites...")
+            
+            sites = Site.objects.bulk_create([
+                Site(
+                    name="Demo Solar Farm",
+                    site_type="solar",
+                    latitude=Decimal('36.7783'),
+                    longitude=Decimal('-119.4179'),
+                    capacity_mw=Decimal('100.0')
+                ),
+                Site(
+                    name="Demo Wind Farm",
+                    site_type="wind",
+                    latitude=Decimal('32.7767'),
+                    longitude=Decimal('-96.7970'),
+                    capacity_mw=Decimal('150.0')
+                ),
+            ])
+            solar_site, wind_site = sites
+            
+            self.stdout.write(f"   ✓ Created {len(sites)} sites:")
+            for site in sites:
+                self.stdout.write(f"     - {site.name}: {site.capacity_mw}MW {site.site_type}")
+            
+            # Step 2: Create portfolio
+            self.stdout.write("\n2. Creating portfolio...")
+            
+            portfolio = Portfolio.objects.create(
+                name="Demo Portfolio",
+                description="Portfolio for demonstration"
+            )
+            portfolio.sites.add(solar_site, wind_site)
         
-        portfolio = Portfolio.objects.create(
-            name="Demo Portfolio",
-            description="Portfolio for demonstration"
-        )
-        portfolio.sites.add(solar_site, wind_site)
+        summary = portfolio.sites.aggregate(site_count=Count('id'), total_capacity=Sum('capacity_mw'))
         
         self.stdout.write(f"   ✓ Created portfolio: {portfolio.name}")
-        self.stdout.write(f"     - Sites: {portfolio.get_site_count()}")
-        self.stdout.write(f"     - Total capacity: {portfolio.get_total_capacity()}MW")
+        self.stdout.write(f"     - Sites: {summary['site_count']}")
+        self.stdout.write(f"     - Total capacity: {summary['total_capacity'] or Decimal('0.00')}MW")
         
         # Step 3: Trigger forecast
         self.stdout.write("\n3. Triggering forecast...")
@@ -69,7 +90,20 @@ class Command(BaseCommand):
         # Step 4: Check job status
         self.stdout.write("\n4. Checking job status...")
         
+        # Jobs handed to Celery workers finish in the background, so poll
         status = service.get_forecast_status(job.id)
+        deadline = time.monotonic() + options['wait_timeout']
+        while not status['is_complete']:
+            if time.monotonic() >= deadline:
+                raise CommandError(
+                    f"Forecast job {job.id} did not finish within {options['wait_timeout']}s"
+                )
+            time.sleep(POLL_INTERVAL_SECONDS)
+            status = service.get_forecast_status(job.id)
+        
+        if not status['is_successful']:
+            raise CommandError(f"Forecast job {job.id} failed: {status['error_message']}")
+        
         self.stdout.write(f"   Status: {status['status']}")
         self.stdout.write(f"   Sites: {status['site_count']}")
         self.stdout.write(f"   Results: {status['result_count']}/{status['expected_results']}")
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-16 02:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forecasting', '0003_alter_site_site_type'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='forecastresult',
+            index=models.Index(fields=['job', 'forecast_datetime'], name='forecasting_job_id_19f675_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='forecastresult',
+            index=models.Index(fields=['site', 'forecast_datetime'], name='forecasting_site_id_7a41c6_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-16 02:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forecasting', '0004_forecastresult_forecasting_job_id_19f675_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='forecastjob',
+            index=models.Index(fields=['portfolio', '-created_at'], name='forecasting_portfol_f2a065_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='forecastjob',
+            index=models.Index(fields=['status'], name='forecasting_status_cdf975_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.7 on 2026-10-16 02:15
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forecasting', '0005_forecastjob_forecasting_portfol_f2a065_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='forecastresult',
+            name='confidence_interval_lower',
+            field=models.FloatField(blank=True, help_text='Lower bound of confidence interval', null=True, validators=[django.core.validators.MinValueValidator(0.0)]),
+        ),
+        migrations.AlterField(
+            model_name='forecastresult',
+            name='confidence_interval_upper',
+            field=models.FloatField(blank=True, help_text='Upper bound of confidence interval', null=True, validators=[django.core.validators.MinValueValidator(0.0)]),
+        ),
+        migrations.AlterField(
+            model_name='forecastresult',
+            name='predicted_generation_mwh',
+            field=models.FloatField(help_text='Predicted energy generation in MWh', validators=[django.core.validators.MinValueValidator(0.0)]),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.7 on 2026-10-16 02:20
+
+from django.db import migrations, models
+import forecasting.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forecasting', '0006_alter_forecastresult_confidence_interval_lower_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='forecastjob',
+            name='id',
+            field=models.UUIDField(default=forecasting.models.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-16 02:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forecasting', '0007_alter_forecastjob_id'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='forecastjob',
+            index=models.Index(fields=['portfolio', 'status', '-completed_at'], name='forecasting_portfol_a7e67d_idx'),
+        ),
+    ]
@@ -1,9 +1,30 @@
+import os
+import time
 import uuid
 from django.db import models
+from django.db.models.signals import m2m_changed
+from django.dispatch import receiver
 from django.core.validators import MinValueValidator, MaxValueValidator
 from decimal import Decimal
 
 
+def uuid7() -> uuid.UUID:
+    """
+    Generate a time-ordered UUID (RFC 9562 version 7).
+    
+    The leading 48 bits are the Unix time in milliseconds, so new IDs sort
+    after older ones and primary key inserts append to the end of the index.
+    """
+    value = (time.time_ns() // 1_000_000) << 80
+    value |= int.from_bytes(os.urandom(10), 'big') & ((1 << 80) - 1)
+    # Set the version (7) and RFC 4122 variant bits
+    value &= ~(0xF << 76)
+    value |= 0x7 << 76
+    value &= ~(0x3 << 62)
+    value |= 0x2 << 62
+    return uuid.UUID(int=value)
+
+
 class Site(models.Model):
     """Model representing a renewable energy site (solar or wind)."""
     
@@ -61,10 +82,14 @@ class Site(models.Model):
         from django.core.exceptions import ValidationError
         
         # Ensure site type is valid
-        if self.site_type not in dict(self.SITE_TYPE_CHOICES):
+        if self.site_type not in _SITE_TYPES:
             raise ValidationError({'site_type': 'Invalid site type'})
 
 
+# Valid Site.site_type values, built once for validation
+_SITE_TYPES = frozenset(site_type for site_type, _ in Site.SITE_TYPE_CHOICES)
+
+
 class Portfolio(models.Model):
     """Model representing a portfolio of renewable energy sites."""
     
@@ -81,15 +106,28 @@ class Portfolio(models.Model):
     def __str__(self):
         return self.name
     
+    def _capacity_stats(self):
+        """
+        Fetch total capacity and site count in one query.
+        
+        The result is cached on the instance and cleared when its sites change
+        through ``sites.add/remove/set/clear``; reload the portfolio after
+        writing PortfolioSite rows directly to see updated figures.
+        """
+        if not hasattr(self, '_capacity_stats_cache'):
+            self._capacity_stats_cache = self.sites.aggregate(
+                total=models.Sum('capacity_mw'),
+                count=models.Count('id')
+            )
+        return self._capacity_stats_cache
+    
     def get_total_capacity(self):
         """Calculate total capacity of all sites in the portfolio."""
-        return self.sites.aggregate(
-            total=models.Sum('capacity_mw')
-        )['total'] or Decimal('0.00')
+        return self._capacity_stats()['total'] or Decimal('0.00')
     
     def get_site_count(self):
         """Get the number of sites in this portfolio."""
-        return self.sites.count()
+        return self._capacity_stats()['count']
 
 
 class PortfolioSite(models.Model):
@@ -107,6 +145,13 @@ class PortfolioSite(models.Model):
         return f"{self.portfolio.name} - {self.site.name}"
 
 
+@receiver(m2m_changed, sender=PortfolioSite)
+def clear_portfolio_capacity_stats(sender, instance, action, **kwargs):
+    """Drop a portfolio's cached capacity stats after its sites change."""
+    if action in ('post_add', 'post_remove', 'post_clear') and isinstance(instance, Portfolio):
+        instance.__dict__.pop('_capacity_stats_cache', None)
+
+
 class ForecastJob(models.Model):
     """Model representing an asynchronous forecasting job."""
     
@@ -117,7 +162,7 @@ class ForecastJob(models.Model):
         ('failed', 'Failed'),
     ]
     
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     portfolio = models.ForeignKey(Portfolio, on_delete=models.CASCADE)
     status = models.CharField(
         max_length=20, 
@@ -138,6 +183,11 @@ class ForecastJob(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['portfolio', '-created_at']),
+            models.Index(fields=['status']),
+            models.Index(fields=['portfolio', 'status', '-completed_at']),
+        ]
         
     def __str__(self):
         return f"Forecast Job {self.id} - {self.portfolio.name} ({self.status})"
@@ -164,26 +214,20 @@ class ForecastResult(models.Model):
     forecast_datetime = models.DateTimeField(
         help_text="The datetime this forecast is for"
     )
-    predicted_generation_mwh = models.DecimalField(
-        max_digits=10, 
-        decimal_places=3,
-        validators=[MinValueValidator(Decimal('0.0'))],
+    predicted_generation_mwh = models.FloatField(
+        validators=[MinValueValidator(0.0)],
         help_text="Predicted energy generation in MWh"
     )
-    confidence_interval_lower = models.DecimalField(
-        max_digits=10, 
-        decimal_places=3, 
+    confidence_interval_lower = models.FloatField(
         null=True, 
         blank=True,
-        validators=[MinValueValidator(Decimal('0.0'))],
+        validators=[MinValueValidator(0.0)],
         help_text="Lower bound of confidence interval"
     )
-    confidence_interval_upper = models.DecimalField(
-        max_digits=10, 
-        decimal_places=3, 
+    confidence_interval_upper = models.FloatField(
         null=True, 
         blank=True,
-        validators=[MinValueValidator(Decimal('0.0'))],
+        validators=[MinValueValidator(0.0)],
         help_text="Upper bound of confidence interval"
     )
     created_at = models.DateTimeField(auto_now_add=True)
@@ -191,6 +235,10 @@ class ForecastResult(models.Model):
     class Meta:
         ordering = ['forecast_datetime']
         unique_together = ['job', 'site', 'forecast_datetime']
+        indexes = [
+            models.Index(fields=['job', 'forecast_datetime']),
+            models.Index(fields=['site', 'forecast_datetime']),
+        ]
         
     def __str__(self):
         return f"Forecast for {self.site.name} at {self.forecast_datetime}"
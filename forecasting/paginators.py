@@ -0,0 +1,49 @@
+"""
+Paginators for admin changelists over large forecasting tables.
+
+Forecast jobs and results accumulate with every run, so the ``COUNT(*)``
+Django's default paginator issues on each changelist page load becomes the
+most expensive query on those pages.
+"""
+
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that skips ``COUNT(*)`` where the table size can be estimated.
+
+    On PostgreSQL an unfiltered changelist reports the planner's row estimate
+    from ``pg_class``. Filtered changelists and other databases fall back to
+    the exact count.
+    """
+
+    @cached_property
+    def count(self):
+        """Return the estimated number of objects, or the exact count."""
+        estimate = self._estimate_count()
+        return estimate if estimate is not None else super().count
+
+    def _estimate_count(self):
+        """Return the PostgreSQL row estimate for unfiltered querysets, else None."""
+        query = getattr(self.object_list, 'query', None)
+        if query is None or query.where:
+            return None
+
+        connection = connections[self.object_list.db]
+        if connection.vendor != 'postgresql':
+            return None
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples FROM pg_class WHERE relname = %s",
+                [self.object_list.model._meta.db_table]
+            )
+            row = cursor.fetchone()
+
+        # reltuples is -1 for tables that have never been analyzed
+        if not row or row[0] < 0:
+            return None
+        return int(row[0])
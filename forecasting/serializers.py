@@ -13,41 +13,33 @@ class SiteSerializer(serializers.ModelSerializer):
             'capacity_mw', 'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
-    
-    def validate_name(self, value):
-        """Validate that site name is not empty and has reasonable length."""
-        if not value or not value.strip():
-            raise serializers.ValidationError("Site name cannot be empty.")
-        if len(value.strip()) < 2:
-            raise serializers.ValidationError("Site name must be at least 2 characters long.")
-        return value.strip()
-    
-    def validate_site_type(self, value):
-        """Validate that site type is one of the allowed choices."""
-        valid_types = [choice[0] for choice in Site.SITE_TYPE_CHOICES]
-        if value not in valid_types:
-            raise serializers.ValidationError(
-                f"Invalid site type. Must be one of: {', '.join(valid_types)}"
-            )
-        return value
-    
-    def validate_latitude(self, value):
-        """Validate latitude is within valid range."""
-        if value < Decimal('-90.0') or value > Decimal('90.0'):
-            raise serializers.ValidationError("Latitude must be between -90 and 90 degrees.")
-        return value
-    
-    def validate_longitude(self, value):
-        """Validate longitude is within valid range."""
-        if value < Decimal('-180.0') or value > Decimal('180.0'):
-            raise serializers.ValidationError("Longitude must be between -180 and 180 degrees.")
-        return value
-    
-    def validate_capacity_mw(self, value):
-        """Validate capacity is positive if provided."""
-        if value is not None and value <= 0:
-            raise serializers.ValidationError("Capacity must be greater than 0 MW.")
-        return value
+        # Range checks come from the model validators; only the messages are customized
+        extra_kwargs = {
+            'name': {
+                'min_length': 2,
+                'error_messages': {
+                    'blank': "Site name cannot be empty.",
+                    'min_length': "Site name must be at least 2 characters long.",
+                },
+            },
+            'latitude': {
+                'error_messages': {
+                    'min_value': "Latitude must be between -90 and 90 degrees.",
+                    'max_value': "Latitude must be between -90 and 90 degrees.",
+                },
+            },
+            'longitude': {
+                'error_messages': {
+                    'min_value': "Longitude must be between -180 and 180 degrees.",
+                    'max_value': "Longitude must be between -180 and 180 degrees.",
+                },
+            },
+            'capacity_mw': {
+                'error_messages': {
+                    'min_value': "Capacity must be greater than 0 MW.",
+                },
+            },
+        }
     
     def validate(self, data):
         """Cross-field validation to check for duplicate coordinates."""
@@ -88,43 +80,49 @@ class PortfolioSerializer(serializers.ModelSerializer):
             'total_capacity', 'site_count', 'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at', 'total_capacity', 'site_count']
+        extra_kwargs = {
+            'name': {
+                'min_length': 2,
+                'error_messages': {
+                    'blank': "Portfolio name cannot be empty.",
+                    'min_length': "Portfolio name must be at least 2 characters long.",
+                },
+            },
+        }
     
     def get_total_capacity(self, obj):
         """Get the total capacity of all sites in the portfolio."""
+        # PortfolioViewSet annotates both figures; other callers fall back to a query
+        if hasattr(obj, '_site_count'):
+            return obj._total_capacity or Decimal('0.00')
         return obj.get_total_capacity()
     
     def get_site_count(self, obj):
         """Get the number of sites in the portfolio."""
+        if hasattr(obj, '_site_count'):
+            return obj._site_count
         return obj.get_site_count()
     
-    def validate_name(self, value):
-        """Validate that portfolio name is not empty and has reasonable length."""
-        if not value or not value.strip():
-            raise serializers.ValidationError("Portfolio name cannot be empty.")
-        if len(value.strip()) < 2:
-            raise serializers.ValidationError("Portfolio name must be at least 2 characters long.")
-        return value.strip()
-    
     def validate_site_ids(self, value):
         """Validate that all provided site IDs exist."""
         if not value:
             return value
         
-        # Check that all site IDs exist
-        existing_sites = Site.objects.filter(id__in=value)
-        existing_ids = set(existing_sites.values_list('id', flat=True))
+        # Check for duplicates
         provided_ids = set(value)
+        if len(value) != len(provided_ids):
+            raise serializers.ValidationError("Duplicate site IDs are not allowed.")
         
-        missing_ids = provided_ids - existing_ids
-        if missing_ids:
+        # Check that all site IDs exist; only a failed count pays for the
+        # second query that names the missing IDs
+        existing_sites = Site.objects.filter(id__in=provided_ids)
+        if existing_sites.count() != len(provided_ids):
+            existing_ids = set(existing_sites.values_list('id', flat=True))
+            missing_ids = provided_ids - existing_ids
             raise serializers.ValidationError(
-                f"The following site IDs do not exist: {', '.join(map(str, missing_ids))}"
+                f"The following site IDs do not exist: {', '.join(map(str, sorted(missing_ids)))}"
             )
         
-        # Check for duplicates
-        if len(value) != len(set(value)):
-            raise serializers.ValidationError("Duplicate site IDs are not allowed.")
-        
         return value
     
     def create(self, validated_data):
@@ -133,8 +131,11 @@ class PortfolioSerializer(serializers.ModelSerializer):
         portfolio = Portfolio.objects.create(**validated_data)
         
         if site_ids:
-            sites = Site.objects.filter(id__in=site_ids)
-            portfolio.sites.set(sites)
+            # Site IDs were validated above, so link them without refetching
+            PortfolioSite.objects.bulk_create([
+                PortfolioSite(portfolio=portfolio, site_id=site_id)
+                for site_id in site_ids
+            ])
         
         return portfolio
     
@@ -149,8 +150,10 @@ class PortfolioSerializer(serializers.ModelSerializer):
         
         # Update site associations if site_ids provided
         if site_ids is not None:
-            sites = Site.objects.filter(id__in=site_ids)
-            instance.sites.set(sites)
+            instance.sites.set(site_ids)
+            # Site count and capacity loaded before the change are now stale
+            for attr in ('_site_count', '_total_capacity'):
+                instance.__dict__.pop(attr, None)
         
         return instance
 
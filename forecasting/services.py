@@ -6,21 +6,88 @@ requests, async job processing, and forecast result generation.
 """
 
 import logging
+import threading
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from decimal import Decimal
-from typing import List, Optional, Dict, Any
+from typing import Iterable, List, Optional, Dict, Any, Sequence, Tuple
 from uuid import UUID
 
-from django.db import transaction
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.db import connections, router, transaction
+from django.db.models import Count, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from django.core.exceptions import ValidationError
 
-from .models import Portfolio, Site, ForecastJob, ForecastResult
-from .forecast_engine import model_registry, ForecastPoint
+from .models import Portfolio, PortfolioSite, Site, ForecastJob, ForecastResult
+from .forecast_engine import model_registry, ForecastModel, ForecastPoint
 
 
 logger = logging.getLogger(__name__)
 
+# Number of ForecastResult rows written per INSERT statement
+RESULT_BATCH_SIZE = 1000
+
+# Number of ForecastResult rows fetched per round trip when streaming results
+RESULT_ITERATOR_CHUNK_SIZE = 2000
+
+# Prefix and lifetime (seconds) of cached status and result responses for
+# finished jobs; bump the version when the response shape changes
+CACHE_KEY_PREFIX = 'forecast:v1'
+FORECAST_CACHE_TIMEOUT = 300
+
+# Per-process cache checked before the shared one; its entries expire sooner
+L1_CACHE_ALIAS = 'forecast_l1'
+L1_CACHE_TIMEOUT = 60
+
+# Maximum number of per-site predictions kept for deterministic models
+PREDICTION_CACHE_SIZE = 1024
+
+# Predictions from deterministic models, keyed by model and site inputs, in LRU order
+_prediction_cache: 'OrderedDict[tuple, Tuple[ForecastPoint, ...]]' = OrderedDict()
+
+# Guards _prediction_cache, which threaded workers share
+_prediction_cache_lock = threading.Lock()
+
+# ForecastResult columns read when building result responses
+RESULT_VALUE_FIELDS = (
+    'forecast_datetime',
+    'predicted_generation_mwh',
+    'confidence_interval_lower',
+    'confidence_interval_upper',
+)
+
+
+def _cache_get(key: str) -> Any:
+    """Look up a cached response in the per-process cache, then the shared one."""
+    l1_cache = caches[L1_CACHE_ALIAS]
+    value = l1_cache.get(key)
+    if value is None:
+        value = cache.get(key)
+        if value is not None:
+            l1_cache.set(key, value, L1_CACHE_TIMEOUT)
+    return value
+
+
+def _cache_set(key: str, value: Any) -> None:
+    """Store a response in both the shared and the per-process cache."""
+    cache.set(key, value, FORECAST_CACHE_TIMEOUT)
+    caches[L1_CACHE_ALIAS].set(key, value, L1_CACHE_TIMEOUT)
+
+
+def _cache_delete_jobs(job_ids: Iterable[UUID]) -> None:
+    """Drop cached status and result responses for deleted jobs from both caches."""
+    keys = [
+        f"{CACHE_KEY_PREFIX}:{kind}:{job_id}"
+        for job_id in job_ids
+        for kind in ('status', 'results')
+    ]
+    if keys:
+        cache.delete_many(keys)
+        caches[L1_CACHE_ALIAS].delete_many(keys)
+
 
 class ForecastServiceError(Exception):
     """Base exception for forecast service errors."""
@@ -42,6 +109,11 @@ class JobNotFoundError(ForecastServiceError):
     pass
 
 
+class JobCancelledError(ForecastServiceError):
+    """Raised when a forecast job is cancelled while it is being processed."""
+    pass
+
+
 class ForecastService:
     """
     Service class for managing forecast operations.
@@ -83,7 +155,10 @@ class ForecastService:
             # Validate portfolio exists and has sites
             portfolio = self._get_portfolio_with_sites(portfolio_id)
             
-            if portfolio.get_site_count() == 0:
+            # Count from the prefetched sites rather than issuing a COUNT query
+            site_count = len(portfolio.sites.all())
+            
+            if site_count == 0:
                 raise EmptyPortfolioError(
                     f"Portfolio '{portfolio.name}' (ID: {portfolio_id}) has no sites"
                 )
@@ -91,7 +166,10 @@ class ForecastService:
             # Use provided horizon or default
             horizon = forecast_horizon or self.forecast_horizon
             
-            # Create forecast job
+            async_jobs = getattr(settings, 'FORECAST_ASYNC_JOBS', False)
+            
+            # Create the forecast job and queue it together, so a failure to
+            # queue rolls back the insert rather than orphaning a pending job
             with transaction.atomic():
                 job = ForecastJob.objects.create(
                     portfolio=portfolio,
@@ -101,11 +179,15 @@ class ForecastService:
                 
                 self.logger.info(
                     f"Created forecast job {job.id} for portfolio '{portfolio.name}' "
-                    f"with {portfolio.get_site_count()} sites"
+                    f"with {site_count} sites"
                 )
+                
+                if async_jobs:
+                    self._enqueue_forecast_job(job)
             
-            # Process the forecast (in a real system, this would be async)
-            self._process_forecast_job(job, horizon)
+            # Without a background worker, process the job inline
+            if not async_jobs:
+                self._process_forecast_job(job, horizon)
             
             return job
             
@@ -131,8 +213,29 @@ class ForecastService:
         Raises:
             JobNotFoundError: If job doesn't exist
         """
+        cache_key = f"{CACHE_KEY_PREFIX}:status:{job_id}"
+        status_info = _cache_get(cache_key)
+        if status_info is not None:
+            return status_info
+        
         try:
-            job = ForecastJob.objects.select_related('portfolio').get(id=job_id)
+            # Result and site counts are correlated subqueries so the job row
+            # is not multiplied by joins to either table
+            result_counts = ForecastResult.objects.filter(
+                job=OuterRef('pk')
+            ).order_by().values('job').annotate(count=Count('id')).values('count')
+            site_counts = PortfolioSite.objects.filter(
+                portfolio=OuterRef('portfolio_id')
+            ).order_by().values('portfolio').annotate(count=Count('id')).values('count')
+            
+            # Only the portfolio's id and name are reported, so skip its other columns
+            job = ForecastJob.objects.select_related('portfolio').only(
+                'id', 'status', 'forecast_horizon', 'created_at', 'completed_at',
+                'error_message', 'portfolio__id', 'portfolio__name'
+            ).annotate(
+                result_count=Coalesce(Subquery(result_counts), 0),
+                site_count=Coalesce(Subquery(site_counts), 0)
+            ).get(id=job_id)
             
             status_info = {
                 'job_id': str(job.id),
@@ -148,11 +251,11 @@ class ForecastService:
             
             # Add result count if completed successfully
             if job.is_successful():
-                result_count = job.results.count()
+                result_count = job.result_count
                 status_info['result_count'] = result_count
                 
                 # Add site count for validation
-                site_count = job.portfolio.get_site_count()
+                site_count = job.site_count
                 status_info['site_count'] = site_count
                 
                 # Calculate expected vs actual results
@@ -161,6 +264,10 @@ class ForecastService:
                 status_info['results_complete'] = result_count >= expected_results
                 status_info['forecast_horizon'] = job.forecast_horizon
             
+            # Finished jobs no longer change; pending and running ones are re-read
+            if job.is_complete():
+                _cache_set(cache_key, status_info)
+            
             return status_info
             
         except ForecastJob.DoesNotExist:
@@ -183,84 +290,117 @@ class ForecastService:
             JobNotFoundError: If no forecast results are available
         """
         try:
-            portfolio = Portfolio.objects.get(id=portfolio_id)
-            
-            # Get the forecast job
+            # Get the forecast job together with its portfolio and the
+            # portfolio's current total capacity in one query
+            portfolio_capacity = PortfolioSite.objects.filter(
+                portfolio=OuterRef('portfolio_id')
+            ).order_by().values('portfolio').annotate(
+                total=Sum('site__capacity_mw')
+            ).values('total')
+            jobs = ForecastJob.objects.select_related('portfolio').annotate(
+                portfolio_capacity=Subquery(portfolio_capacity)
+            )
             if job_id:
-                job = ForecastJob.objects.get(id=job_id, portfolio=portfolio)
+                job = jobs.filter(id=job_id, portfolio_id=portfolio_id).first()
             else:
-                # Get the latest successful job for this portfolio
-                job = ForecastJob.objects.filter(
-                    portfolio=portfolio,
+                # Get the latest successful job for this portfolio; served by
+                # the (portfolio, status, -completed_at) index
+                job = jobs.filter(
+                    portfolio_id=portfolio_id,
                     status='completed'
                 ).order_by('-completed_at').first()
-                
-                if not job:
-                    raise JobNotFoundError(
-                        f"No completed forecast jobs found for portfolio {portfolio_id}"
-                    )
             
-            # Get all results for this job
-            results = ForecastResult.objects.filter(job=job).select_related('site').order_by(
-                'site__name', 'forecast_datetime'
-            )
+            if not job:
+                # Only a miss needs the portfolio looked up on its own
+                if not Portfolio.objects.filter(id=portfolio_id).exists():
+                    raise Portfolio.DoesNotExist
+                if job_id:
+                    raise ForecastJob.DoesNotExist
+                raise JobNotFoundError(
+                    f"No completed forecast jobs found for portfolio {portfolio_id}"
+                )
             
-            if not results.exists():
-                raise JobNotFoundError(f"No forecast results found for job {job.id}")
+            portfolio = job.portfolio
+            total_capacity_mw = float(job.portfolio_capacity or 0)
+            
+            # Results are written together with the job's completion and never
+            # change afterwards, so responses are cached per job. The portfolio's
+            # name and capacity can change later, so they are refreshed on a hit
+            cache_key = f"{CACHE_KEY_PREFIX}:results:{job.id}"
+            response = _cache_get(cache_key)
+            if response is not None:
+                response.update(
+                    portfolio_name=portfolio.name,
+                    total_capacity_mw=total_capacity_mw
+                )
+                return response
             
-            # Organize results by site
+            # Read plain rows rather than hydrating ForecastResult and Site instances
+            rows = ForecastResult.objects.filter(job=job).values(
+                *RESULT_VALUE_FIELDS,
+                'site_id', 'site__name', 'site__site_type', 'site__capacity_mw'
+            ).order_by('site__name', 'forecast_datetime')
+            
+            # Organize results by site; result values are float columns and
+            # need no conversion
             site_forecasts = {}
-            total_by_datetime = {}
             
-            for result in results:
-                site_name = result.site.name
-                site_id = result.site.id
+            for row in rows.iterator(chunk_size=RESULT_ITERATOR_CHUNK_SIZE):
+                site_name = row['site__name']
                 
                 if site_name not in site_forecasts:
                     site_forecasts[site_name] = {
-                        'site_id': site_id,
+                        'site_id': row['site_id'],
                         'site_name': site_name,
-                        'site_type': result.site.site_type,
-                        'capacity_mw': float(result.site.capacity_mw or 0),
+                        'site_type': row['site__site_type'],
+                        'capacity_mw': float(row['site__capacity_mw'] or 0),
                         'forecasts': []
                     }
                 
                 forecast_data = {
-                    'datetime': result.forecast_datetime,
-                    'predicted_generation_mwh': float(result.predicted_generation_mwh),
-                    'confidence_interval_lower': float(result.confidence_interval_lower or 0),
-                    'confidence_interval_upper': float(result.confidence_interval_upper or 0)
+                    'datetime': row['forecast_datetime'],
+                    'predicted_generation_mwh': row['predicted_generation_mwh'],
+                    'confidence_interval_lower': row['confidence_interval_lower'] or 0.0,
+                    'confidence_interval_upper': row['confidence_interval_upper'] or 0.0
                 }
                 
                 site_forecasts[site_name]['forecasts'].append(forecast_data)
-                
-                # Aggregate for portfolio total
-                dt_key = result.forecast_datetime
-                if dt_key not in total_by_datetime:
-                    total_by_datetime[dt_key] = {
-                        'datetime': dt_key,
-                        'total_predicted_mwh': 0,
-                        'total_confidence_lower': 0,
-                        'total_confidence_upper': 0
-                    }
-                
-                total_by_datetime[dt_key]['total_predicted_mwh'] += float(result.predicted_generation_mwh)
-                total_by_datetime[dt_key]['total_confidence_lower'] += float(result.confidence_interval_lower or 0)
-                total_by_datetime[dt_key]['total_confidence_upper'] += float(result.confidence_interval_upper or 0)
             
-            # Convert aggregated totals to list
-            portfolio_totals = sorted(total_by_datetime.values(), key=lambda x: x['datetime'])
+            if not site_forecasts:
+                raise JobNotFoundError(f"No forecast results found for job {job.id}")
             
-            return {
+            # Sum the portfolio total for each hour in the database
+            hourly_totals = ForecastResult.objects.filter(job=job).values(
+                'forecast_datetime'
+            ).annotate(
+                total_predicted_mwh=Sum('predicted_generation_mwh'),
+                total_confidence_lower=Sum(Coalesce('confidence_interval_lower', 0.0)),
+                total_confidence_upper=Sum(Coalesce('confidence_interval_upper', 0.0))
+            ).order_by('forecast_datetime')
+            
+            portfolio_totals = [
+                {
+                    'datetime': total['forecast_datetime'],
+                    'total_predicted_mwh': total['total_predicted_mwh'],
+                    'total_confidence_lower': total['total_confidence_lower'],
+                    'total_confidence_upper': total['total_confidence_upper']
+                }
+                for total in hourly_totals
+            ]
+            
+            response = {
                 'job_id': str(job.id),
                 'portfolio_id': portfolio.id,
                 'portfolio_name': portfolio.name,
                 'forecast_generated_at': job.completed_at,
                 'site_count': len(site_forecasts),
-                'total_capacity_mw': float(portfolio.get_total_capacity()),
+                'total_capacity_mw': total_capacity_mw,
                 'site_forecasts': list(site_forecasts.values()),
                 'portfolio_totals': portfolio_totals
             }
+            _cache_set(cache_key, response)
+            
+            return response
             
         except Portfolio.DoesNotExist:
             raise PortfolioNotFoundError(f"Portfolio with ID {portfolio_id} not found")
@@ -303,21 +443,21 @@ class ForecastService:
                 
                 results_query = results_query.filter(job=latest_job)
             
-            results = results_query.order_by('forecast_datetime')
-            
-            if not results.exists():
-                raise JobNotFoundError(f"No forecast results found for site {site_id}")
+            rows = results_query.values(*RESULT_VALUE_FIELDS).order_by('forecast_datetime')
             
             # Format results
             forecasts = []
-            for result in results:
+            for row in rows.iterator(chunk_size=RESULT_ITERATOR_CHUNK_SIZE):
                 forecasts.append({
-                    'datetime': result.forecast_datetime,
-                    'predicted_generation_mwh': float(result.predicted_generation_mwh),
-                    'confidence_interval_lower': float(result.confidence_interval_lower or 0),
-                    'confidence_interval_upper': float(result.confidence_interval_upper or 0)
+                    'datetime': row['forecast_datetime'],
+                    'predicted_generation_mwh': row['predicted_generation_mwh'],
+                    'confidence_interval_lower': row['confidence_interval_lower'] or 0.0,
+                    'confidence_interval_upper': row['confidence_interval_upper'] or 0.0
                 })
             
+            if not forecasts:
+                raise JobNotFoundError(f"No forecast results found for site {site_id}")
+            
             return {
                 'site_id': site.id,
                 'site_name': site.name,
@@ -345,83 +485,230 @@ class ForecastService:
         """
         return Portfolio.objects.prefetch_related('sites').get(id=portfolio_id)
     
+    def run_forecast_job(self, job_id: UUID) -> None:
+        """
+        Process a queued forecast job.
+        
+        Entry point for background workers. Jobs that are no longer pending
+        (e.g. cancelled before a worker picked them up, or already claimed by
+        another worker after a redelivery) are skipped.
+        
+        Args:
+            job_id: UUID of the forecast job to process
+            
+        Raises:
+            JobNotFoundError: If job doesn't exist
+            ForecastServiceError: If forecast processing fails
+        """
+        try:
+            job = ForecastJob.objects.select_related('portfolio').get(id=job_id)
+        except ForecastJob.DoesNotExist:
+            raise JobNotFoundError(f"Forecast job with ID {job_id} not found")
+        
+        self._process_forecast_job(job, job.forecast_horizon)
+    
+    def _enqueue_forecast_job(self, job: ForecastJob) -> None:
+        """
+        Queue a forecast job for processing by a Celery worker.
+        
+        The task is sent once the surrounding transaction commits so the
+        worker never sees a job row that doesn't exist yet.
+        
+        Args:
+            job: The pending ForecastJob to queue
+        """
+        from .tasks import run_portfolio_forecast
+        
+        if not hasattr(run_portfolio_forecast, 'delay'):
+            raise ForecastServiceError(
+                "FORECAST_ASYNC_JOBS is enabled but Celery is not installed"
+            )
+        
+        job_id = str(job.id)
+        transaction.on_commit(lambda: run_portfolio_forecast.delay(job_id))
+        self.logger.info(f"Queued forecast job {job_id}")
+    
     def _process_forecast_job(self, job: ForecastJob, forecast_horizon: int) -> None:
         """
         Process a forecast job by generating predictions for all sites.
         
         This method updates the job status and creates forecast results.
-        In a production system, this would typically run asynchronously.
+        It runs inline unless FORECAST_ASYNC_JOBS hands it to a worker.
+        Jobs that are no longer pending when processing starts are skipped,
+        and a job cancelled while running keeps its cancelled status.
         
         Args:
             job: The ForecastJob to process
             forecast_horizon: Number of hours to forecast
         """
+        # Claim the job with a conditional UPDATE so a cancel or another
+        # worker that got there first can't be overwritten back to running
+        claimed = ForecastJob.objects.filter(
+            id=job.id,
+            status='pending'
+        ).update(status='running')
+        
+        if not claimed:
+            self.logger.warning(f"Skipping forecast job {job.id}; it is no longer pending")
+            return
+        
+        job.status = 'running'
+        
         try:
-            # Update job status to running
-            job.status = 'running'
-            job.save(update_fields=['status'])
-            
             self.logger.info(f"Processing forecast job {job.id}")
             
-            # Get all sites in the portfolio
-            sites = job.portfolio.sites.all()
+            # Load the portfolio's sites once; they are reused for the count below
+            sites = list(job.portfolio.sites.all())
             
-            if not sites.exists():
+            if not sites:
                 raise EmptyPortfolioError("Portfolio has no sites")
             
-            # Generate forecasts for each site
-            total_results_created = 0
+            # All sites in a job share the same forecast start hour
+            start_time = timezone.now().replace(minute=0, second=0, microsecond=0)
+            
+            # Resolve each site type's model once rather than per site
+            models_by_type = {
+                site_type: model_registry.get_model(site_type)
+                for site_type in {site.site_type for site in sites}
+            }
+            
+            # Generate forecasts for every site up front so the write
+            # transaction below only covers the inserts and status update
+            forecast_results = []
+            for site in sites:
+                forecast_results.extend(
+                    self._generate_site_results(
+                        job, site, models_by_type[site.site_type], forecast_horizon, start_time
+                    )
+                )
             
             with transaction.atomic():
-                for site in sites:
-                    try:
-                        # Get the appropriate model for this site type
-                        model = model_registry.get_model(site.site_type)
-                        
-                        # Generate predictions
-                        predictions = model.predict(site, forecast_horizon)
-                        
-                        # Create forecast results
-                        for prediction in predictions:
-                            ForecastResult.objects.create(
-                                job=job,
-                                site=site,
-                                forecast_datetime=prediction.datetime,
-                                predicted_generation_mwh=prediction.predicted_generation_mwh,
-                                confidence_interval_lower=prediction.confidence_interval_lower,
-                                confidence_interval_upper=prediction.confidence_interval_upper
-                            )
-                            total_results_created += 1
-                        
-                        self.logger.debug(
-                            f"Generated {len(predictions)} predictions for site '{site.name}'"
-                        )
-                        
-                    except Exception as e:
-                        self.logger.error(f"Failed to generate forecast for site '{site.name}': {e}")
-                        raise
+                # Insert all results for the job in batched multi-row INSERTs
+                ForecastResult.objects.bulk_create(
+                    forecast_results, batch_size=RESULT_BATCH_SIZE
+                )
+                total_results_created = len(forecast_results)
                 
-                # Update job status to completed
-                job.status = 'completed'
-                job.completed_at = timezone.now()
-                job.save(update_fields=['status', 'completed_at'])
+                # Complete the job only if it is still running; raising here
+                # rolls back the inserts for a job cancelled meanwhile
+                if not self._finish_job(job, status='completed', completed_at=timezone.now()):
+                    raise JobCancelledError(f"Forecast job {job.id} was cancelled")
                 
                 self.logger.info(
                     f"Completed forecast job {job.id}. Created {total_results_created} results "
-                    f"for {sites.count()} sites"
+                    f"for {len(sites)} sites"
                 )
         
+        except JobCancelledError:
+            job.refresh_from_db(fields=['status', 'completed_at', 'error_message'])
+            self.logger.warning(f"Forecast job {job.id} was cancelled while running")
+        
         except Exception as e:
-            # Update job status to failed
+            # Update job status to failed, unless it was cancelled meanwhile
             error_message = str(e)
-            job.status = 'failed'
-            job.completed_at = timezone.now()
-            job.error_message = error_message
-            job.save(update_fields=['status', 'completed_at', 'error_message'])
+            self._finish_job(
+                job, status='failed', completed_at=timezone.now(), error_message=error_message
+            )
             
             self.logger.error(f"Forecast job {job.id} failed: {error_message}")
             raise ForecastServiceError(f"Forecast processing failed: {error_message}")
     
+    def _finish_job(self, job: ForecastJob, **fields: Any) -> bool:
+        """
+        Write a running job's final fields and mirror them on the instance.
+        
+        Uses a single UPDATE conditional on the job still running, so a
+        cancel that landed first is never overwritten. Bypasses Model.save()
+        so no save signals are dispatched.
+        
+        Args:
+            job: The running ForecastJob to update
+            **fields: Field values to set
+            
+        Returns:
+            True if the job was still running and has been updated
+        """
+        updated = ForecastJob.objects.filter(id=job.id, status='running').update(**fields)
+        if updated:
+            for name, value in fields.items():
+                setattr(job, name, value)
+        return bool(updated)
+    
+    def _generate_site_results(self, job: ForecastJob, site: Site, model: ForecastModel,
+                               forecast_horizon: int,
+                               start_time: datetime) -> List[ForecastResult]:
+        """
+        Generate unsaved forecast results for a single site.
+        
+        Args:
+            job: The ForecastJob the results belong to
+            site: Site to forecast
+            model: ForecastModel registered for the site's type
+            forecast_horizon: Number of hours to forecast
+            start_time: Datetime of the first forecast hour
+            
+        Returns:
+            List of unsaved ForecastResult instances
+        """
+        try:
+            predictions = self._predict_site(model, site, forecast_horizon, start_time)
+        except Exception as e:
+            self.logger.error(f"Failed to generate forecast for site '{site.name}': {e}")
+            raise
+        
+        self.logger.debug(
+            f"Generated {len(predictions)} predictions for site '{site.name}'"
+        )
+        
+        return [
+            ForecastResult(
+                job=job,
+                site=site,
+                forecast_datetime=prediction.datetime,
+                predicted_generation_mwh=prediction.predicted_generation_mwh,
+                confidence_interval_lower=prediction.confidence_interval_lower,
+                confidence_interval_upper=prediction.confidence_interval_upper
+            )
+            for prediction in predictions
+        ]
+    
+    def _predict_site(self, model: ForecastModel, site: Site, forecast_horizon: int,
+                      start_time: datetime) -> Sequence[ForecastPoint]:
+        """
+        Run a forecast model for one site, reusing output from deterministic models.
+        
+        Args:
+            model: ForecastModel to run
+            site: Site to forecast
+            forecast_horizon: Number of hours to forecast
+            start_time: Datetime of the first forecast hour
+            
+        Returns:
+            Sequence of ForecastPoint objects
+        """
+        if getattr(model, 'deterministic', False) is not True:
+            return model.predict(site, forecast_horizon, start_time=start_time)
+        
+        key = (
+            type(model), model.get_model_name(),
+            site.pk, site.site_type, site.capacity_mw, site.latitude, site.longitude,
+            forecast_horizon, start_time
+        )
+        with _prediction_cache_lock:
+            predictions = _prediction_cache.get(key)
+            if predictions is not None:
+                _prediction_cache.move_to_end(key)
+                return predictions
+        
+        # Predict outside the lock; a concurrent miss on the same key only
+        # repeats the work
+        predictions = tuple(model.predict(site, forecast_horizon, start_time=start_time))
+        with _prediction_cache_lock:
+            _prediction_cache[key] = predictions
+            if len(_prediction_cache) > PREDICTION_CACHE_SIZE:
+                _prediction_cache.popitem(last=False)
+        return predictions
+    
     def cancel_forecast_job(self, job_id: UUID) -> bool:
         """
         Cancel a pending or running forecast job.
@@ -435,25 +722,47 @@ class ForecastService:
         Raises:
             JobNotFoundError: If job doesn't exist
         """
-        try:
-            job = ForecastJob.objects.get(id=job_id)
-            
-            if job.status in ['pending', 'running']:
-                job.status = 'failed'
-                job.completed_at = timezone.now()
-                job.error_message = 'Job cancelled by user'
-                job.save(update_fields=['status', 'completed_at', 'error_message'])
-                
-                self.logger.info(f"Cancelled forecast job {job_id}")
-                return True
-            else:
-                self.logger.warning(
-                    f"Cannot cancel job {job_id} with status '{job.status}'"
-                )
-                return False
-                
-        except ForecastJob.DoesNotExist:
+        # Transition the job in a single conditional UPDATE so a concurrent
+        # cancel or completion cannot interleave with a status check
+        cancelled = ForecastJob.objects.filter(
+            id=job_id,
+            status__in=['pending', 'running']
+        ).update(
+            status='failed',
+            completed_at=timezone.now(),
+            error_message='Job cancelled by user'
+        )
+        
+        if cancelled:
+            self.logger.info(f"Cancelled forecast job {job_id}")
+            return True
+        
+        status = ForecastJob.objects.filter(id=job_id).values_list('status', flat=True).first()
+        if status is None:
             raise JobNotFoundError(f"Forecast job with ID {job_id} not found")
+        
+        self.logger.warning(
+            f"Cannot cancel job {job_id} with status '{status}'"
+        )
+        return False
+    
+    def delete_portfolio(self, portfolio: Portfolio) -> None:
+        """
+        Delete a portfolio together with its forecast jobs and results.
+        
+        Cached responses for the deleted jobs are evicted so they are not
+        served after the delete.
+        
+        Args:
+            portfolio: The Portfolio to delete
+        """
+        with transaction.atomic():
+            job_ids = list(
+                ForecastJob.objects.filter(portfolio=portfolio).values_list('id', flat=True)
+            )
+            portfolio.delete()
+        
+        _cache_delete_jobs(job_ids)
     
     def cleanup_old_jobs(self, days_old: int = 30) -> int:
         """
@@ -472,11 +781,31 @@ class ForecastService:
             completed_at__lt=cutoff_date
         )
         
-        job_count = old_jobs.count()
+        # Delete results, then jobs, with one statement each rather than
+        # loading the jobs to collect the cascade in Python; the job count
+        # comes from the second DELETE instead of a separate COUNT query.
+        # The raw statements run on the database the router writes jobs to
+        db_alias = router.db_for_write(ForecastJob)
+        connection = connections[db_alias]
+        old_jobs = old_jobs.using(db_alias).order_by()
+        job_ids_sql, params = old_jobs.values('id').query.sql_with_params()
+        result_table = connection.ops.quote_name(ForecastResult._meta.db_table)
+        job_table = connection.ops.quote_name(ForecastJob._meta.db_table)
+        
+        with transaction.atomic(using=db_alias), connection.cursor() as cursor:
+            # Cached responses for the deleted jobs are evicted by ID below
+            job_ids = list(old_jobs.values_list('id', flat=True))
+            cursor.execute(
+                f"DELETE FROM {result_table} WHERE job_id IN ({job_ids_sql})", params
+            )
+            cursor.execute(
+                f"DELETE FROM {job_table} WHERE id IN ({job_ids_sql})", params
+            )
+            job_count = cursor.rowcount
+        
+        _cache_delete_jobs(job_ids)
         
         if job_count > 0:
-            # Delete jobs (results will be cascade deleted)
-            old_jobs.delete()
             self.logger.info(f"Cleaned up {job_count} old forecast jobs")
         
         return job_count
\ No newline at end of file
@@ -0,0 +1,33 @@
+"""
+Background tasks for forecast processing.
+
+Forecast jobs are dispatched here by ForecastService when FORECAST_ASYNC_JOBS
+is enabled. Celery is an optional dependency: without it the task function is
+still importable but cannot be queued.
+"""
+
+from uuid import UUID
+
+try:
+    from celery import shared_task
+except ImportError:
+    shared_task = None
+
+from .services import ForecastService
+
+
+def run_portfolio_forecast(job_id: str) -> None:
+    """
+    Process a pending forecast job.
+    
+    Args:
+        job_id: UUID string of the ForecastJob to process
+    """
+    ForecastService().run_forecast_job(UUID(job_id))
+
+
+if shared_task is not None:
+    run_portfolio_forecast = shared_task(
+        name='forecasting.run_portfolio_forecast',
+        ignore_result=True
+    )(run_portfolio_forecast)
@@ -5,10 +5,12 @@ This test suite provides complete coverage of all forecast API endpoints
 including edge cases, error scenarios, and validation requirements.
 """
 
-import json
+import threading
 import uuid
+from datetime import timedelta
 from decimal import Decimal
 from unittest.mock import patch, MagicMock
+from django.db import connection
 from django.test import TestCase
 from django.urls import reverse
 from rest_framework.test import APIClient
@@ -16,17 +18,70 @@ from rest_framework import status
 
 from .models import Site, Portfolio, ForecastJob, ForecastResult
 from .services import ForecastService
+from .test_helpers import create_completed_job
+
+# Queries for an uncached portfolio results request: the job with its
+# portfolio and total capacity, result rows and hourly totals. Raising this
+# should be a deliberate change, not a side effect of a per-site query.
+PORTFOLIO_RESULTS_QUERIES = 3
+
+# JSON trigger bodies with list and dict horizons, which form data can't express
+LIST_HORIZON_BODY = b'{"forecast_horizon": []}'
+DICT_HORIZON_BODY = b'{"forecast_horizon": {}}'
+
+# Exact 0.1-degree steps for the large portfolio's site coordinates, built
+# from strings so float rounding can't leak into the Decimals
+LARGE_PORTFOLIO_OFFSETS = tuple(Decimal(f'0.{i}') for i in range(10))
+
+# Fields each response format must include, checked as subsets of the keys
+REQUIRED_FIELDS = {
+    'trigger': {
+        'job_id', 'portfolio_id', 'portfolio_name', 'status',
+        'created_at', 'message'
+    },
+    'status': {
+        'job_id', 'portfolio_id', 'portfolio_name', 'status',
+        'created_at', 'completed_at', 'error_message', 'is_complete',
+        'is_successful', 'result_count', 'site_count', 'expected_results',
+        'results_complete', 'forecast_horizon'
+    },
+    'portfolio_results': {
+        'job_id', 'portfolio_id', 'portfolio_name', 'forecast_generated_at',
+        'site_count', 'total_capacity_mw', 'site_forecasts', 'portfolio_totals'
+    },
+    'site_forecast': {
+        'site_id', 'site_name', 'site_type', 'capacity_mw', 'forecasts'
+    },
+    'forecast': {
+        'datetime', 'predicted_generation_mwh',
+        'confidence_interval_lower', 'confidence_interval_upper'
+    },
+}
+
+
+def _placeholder_site_results(job, site, model, forecast_horizon, start_time):
+    """Stand in for ForecastService._generate_site_results with zero-valued rows."""
+    return [
+        ForecastResult(
+            job=job,
+            site=site,
+            forecast_datetime=start_time + timedelta(hours=hour),
+            predicted_generation_mwh=0.0
+        )
+        for hour in range(forecast_horizon)
+    ]
 
 
 class ComprehensiveForecastAPITest(TestCase):
     """Comprehensive test suite for forecast API endpoints."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        self.client = APIClient()
-        
+    client_class = APIClient
+    
+    @classmethod
+    def setUpTestData(cls):
+        """Set up fixtures shared by every test in the class."""
         # Create test sites
-        self.solar_site = Site.objects.create(
+        cls.solar_site = Site.objects.create(
             name="Comprehensive Test Solar Site",
             site_type="solar",
             latitude=Decimal('40.7128'),
@@ -34,7 +89,7 @@ class ComprehensiveForecastAPITest(TestCase):
             capacity_mw=Decimal('50.0')
         )
         
-        self.wind_site = Site.objects.create(
+        cls.wind_site = Site.objects.create(
             name="Comprehensive Test Wind Site",
             site_type="wind",
             latitude=Decimal('41.8781'),
@@ -43,101 +98,119 @@ class ComprehensiveForecastAPITest(TestCase):
         )
         
         # Create test portfolio with sites
-        self.portfolio = Portfolio.objects.create(
+        cls.portfolio = Portfolio.objects.create(
             name="Comprehensive Test Portfolio",
             description="Portfolio for comprehensive API testing"
         )
-        self.portfolio.sites.add(self.solar_site, self.wind_site)
+        cls.portfolio.sites.add(cls.solar_site, cls.wind_site)
         
         # Create empty portfolio
-        self.empty_portfolio = Portfolio.objects.create(
+        cls.empty_portfolio = Portfolio.objects.create(
             name="Empty Comprehensive Portfolio",
             description="Empty portfolio for testing"
         )
         
         # Create single-site portfolio
-        self.single_site_portfolio = Portfolio.objects.create(
+        cls.single_site_portfolio = Portfolio.objects.create(
             name="Single Site Portfolio",
             description="Portfolio with only one site"
         )
-        self.single_site_portfolio.sites.add(self.solar_site)
+        cls.single_site_portfolio.sites.add(cls.solar_site)
+        
+        # Endpoint URLs for the fixtures above
+        cls.trigger_url = f'/api/forecasts/portfolio/{cls.portfolio.id}/trigger/'
+        cls.results_url = f'/api/forecasts/portfolio/{cls.portfolio.id}/results/'
+        cls.site_results_url = f'/api/forecasts/site/{cls.solar_site.id}/results/'
+        
+        # Jobs in each state for tests that only read them. Tests that change
+        # a job's status create their own, because responses for finished
+        # jobs are cached by job ID.
+        cls.pending_job, cls.running_job, cls.failed_job = ForecastJob.objects.bulk_create([
+            ForecastJob(portfolio=cls.portfolio, status='pending', forecast_horizon=24),
+            ForecastJob(portfolio=cls.portfolio, status='running', forecast_horizon=24),
+            ForecastJob(
+                portfolio=cls.portfolio,
+                status='failed',
+                forecast_horizon=24,
+                error_message='Test error message'
+            ),
+        ])
+        cls.completed_job = create_completed_job(cls.portfolio, 6)
     
     def test_trigger_portfolio_forecast_all_valid_horizons(self):
         """Test triggering forecasts with various valid horizon values."""
+        url = self.trigger_url
         test_horizons = [1, 6, 12, 24, 48, 72, 168]  # 1 hour to 1 week
         
-        for horizon in test_horizons:
-            with self.subTest(horizon=horizon):
-                url = f'/api/forecasts/portfolio/{self.portfolio.id}/trigger/'
-                response = self.client.post(url, {'forecast_horizon': horizon})
-                
-                self.assertEqual(response.status_code, status.HTTP_201_CREATED)
-                
-                data = response.json()
-                self.assertIn('job_id', data)
-                
-                # Verify job was created with correct horizon
-                job = ForecastJob.objects.get(id=data['job_id'])
-                self.assertEqual(job.forecast_horizon, horizon)
-                
-                # Verify correct number of results
-                expected_results = 2 * horizon  # 2 sites * horizon hours
-                actual_results = job.results.count()
-                self.assertEqual(actual_results, expected_results)
+        # Only the contract and result counts are checked here; real forecast
+        # generation is covered by the single-site test
+        with patch.object(
+            ForecastService, '_generate_site_results', side_effect=_placeholder_site_results
+        ):
+            for horizon in test_horizons:
+                with self.subTest(horizon=horizon):
+                    response = self.client.post(url, {'forecast_horizon': horizon})
+                    
+                    self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+                    
+                    data = response.json()
+                    self.assertIn('job_id', data)
+                    
+                    # Verify job was created with correct horizon
+                    job = ForecastJob.objects.get(id=data['job_id'])
+                    self.assertEqual(job.forecast_horizon, horizon)
+                    
+                    # Verify correct number of results
+                    expected_results = 2 * horizon  # 2 sites * horizon hours
+                    actual_results = job.results.count()
+                    self.assertEqual(actual_results, expected_results)
     
     def test_trigger_portfolio_forecast_boundary_conditions(self):
         """Test forecast triggering with boundary condition values."""
-        url = f'/api/forecasts/portfolio/{self.portfolio.id}/trigger/'
+        url = self.trigger_url
         
         # Test minimum valid horizon
         response = self.client.post(url, {'forecast_horizon': 1})
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         
-        # Test large but reasonable horizon
-        response = self.client.post(url, {'forecast_horizon': 8760})  # 1 year
+        # Test large but reasonable horizon; skip generating its 17,520
+        # results, since only acceptance of the horizon is under test
+        with patch('forecasting.services.ForecastService._process_forecast_job') as mock_process:
+            response = self.client.post(url, {'forecast_horizon': 8760})  # 1 year
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        
+        job = ForecastJob.objects.get(id=response.json()['job_id'])
+        self.assertEqual(job.forecast_horizon, 8760)
+        mock_process.assert_called_once_with(job, 8760)
     
     def test_trigger_portfolio_forecast_invalid_data_types(self):
         """Test forecast triggering with various invalid data types."""
-        url = f'/api/forecasts/portfolio/{self.portfolio.id}/trigger/'
+        url = self.trigger_url
+        
+        # Invalid horizons: strings and a float as form data, and a list and
+        # a dict, which only JSON can express
+        invalid_requests = [
+            ({'forecast_horizon': 'string'}, None),
+            ({'forecast_horizon': ''}, None),
+            ({'forecast_horizon': 'null'}, None),
+            ({'forecast_horizon': 'undefined'}, None),
+            ({'forecast_horizon': 3.14}, None),
+            (LIST_HORIZON_BODY, 'application/json'),
+            (DICT_HORIZON_BODY, 'application/json'),
+        ]
         
-        # Test string values
-        string_horizons = ['string', '', 'null', 'undefined']
-        for invalid_horizon in string_horizons:
-            with self.subTest(horizon=invalid_horizon):
-                response = self.client.post(url, {'forecast_horizon': invalid_horizon})
+        for body, content_type in invalid_requests:
+            with self.subTest(body=body):
+                response = self.client.post(url, body, content_type=content_type)
                 self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
                 
                 data = response.json()
                 self.assertIn('error', data)
                 self.assertEqual(data['error'], 'Invalid forecast horizon')
         
-        # Test float value
-        response = self.client.post(url, {'forecast_horizon': 3.14})
-        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
-        
         # Test empty request (no forecast_horizon)
         response = self.client.post(url, {})
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)  # Should use default
-        
-        # Test JSON format for complex data types
-        import json
-        
-        # Test list
-        response = self.client.post(
-            url, 
-            json.dumps({'forecast_horizon': []}),
-            content_type='application/json'
-        )
-        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
-        
-        # Test dict
-        response = self.client.post(
-            url, 
-            json.dumps({'forecast_horizon': {}}),
-            content_type='application/json'
-        )
-        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
     
     def test_trigger_portfolio_forecast_single_site(self):
         """Test triggering forecast for portfolio with single site."""
@@ -155,37 +228,11 @@ class ComprehensiveForecastAPITest(TestCase):
     
     def test_get_job_status_all_states(self):
         """Test getting job status for jobs in all possible states."""
-        # Create jobs in different states
-        pending_job = ForecastJob.objects.create(
-            portfolio=self.portfolio,
-            status='pending',
-            forecast_horizon=24
-        )
-        
-        running_job = ForecastJob.objects.create(
-            portfolio=self.portfolio,
-            status='running',
-            forecast_horizon=24
-        )
-        
-        completed_job = ForecastJob.objects.create(
-            portfolio=self.portfolio,
-            status='completed',
-            forecast_horizon=24
-        )
-        
-        failed_job = ForecastJob.objects.create(
-            portfolio=self.portfolio,
-            status='failed',
-            forecast_horizon=24,
-            error_message='Test error message'
-        )
-        
         jobs_to_test = [
-            (pending_job, 'pending'),
-            (running_job, 'running'),
-            (completed_job, 'completed'),
-            (failed_job, 'failed')
+            (self.pending_job, 'pending'),
+            (self.running_job, 'running'),
+            (self.completed_job, 'completed'),
+            (self.failed_job, 'failed')
         ]
         
         for job, expected_status in jobs_to_test:
@@ -205,13 +252,13 @@ class ComprehensiveForecastAPITest(TestCase):
     def test_get_portfolio_results_multiple_jobs(self):
         """Test getting portfolio results when multiple jobs exist."""
         # Create multiple jobs with different horizons
-        job1 = self._create_completed_job(self.portfolio, 6)
-        job2 = self._create_completed_job(self.portfolio, 12)
-        job3 = self._create_completed_job(self.portfolio, 24)
+        job1 = create_completed_job(self.portfolio, 6)
+        job2 = create_completed_job(self.portfolio, 12)
+        job3 = create_completed_job(self.portfolio, 24)
         
         # Test getting latest results (should be job3)
-        url = f'/api/forecasts/portfolio/{self.portfolio.id}/results/'
-        response = self.client.get(url)
+        with self.assertNumQueries(PORTFOLIO_RESULTS_QUERIES):
+            response = self.client.get(self.results_url)
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         
@@ -221,7 +268,7 @@ class ComprehensiveForecastAPITest(TestCase):
         # Test getting specific job results
         for job in [job1, job2, job3]:
             with self.subTest(job_id=job.id):
-                url = f'/api/forecasts/portfolio/{self.portfolio.id}/results/?job_id={job.id}'
+                url = f'{self.results_url}?job_id={job.id}'
                 response = self.client.get(url)
                 
                 self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -232,11 +279,11 @@ class ComprehensiveForecastAPITest(TestCase):
     def test_get_site_results_multiple_jobs(self):
         """Test getting site results when multiple jobs exist."""
         # Create multiple jobs
-        job1 = self._create_completed_job(self.portfolio, 6)
-        job2 = self._create_completed_job(self.portfolio, 12)
+        job1 = create_completed_job(self.portfolio, 6)
+        job2 = create_completed_job(self.portfolio, 12)
         
         # Test getting latest results for site
-        url = f'/api/forecasts/site/{self.solar_site.id}/results/'
+        url = self.site_results_url
         response = self.client.get(url)
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -246,7 +293,7 @@ class ComprehensiveForecastAPITest(TestCase):
         self.assertEqual(data['forecast_count'], 12)  # Latest job has 12 hours
         
         # Test getting specific job results for site
-        url = f'/api/forecasts/site/{self.solar_site.id}/results/?job_id={job1.id}'
+        url = f'{self.site_results_url}?job_id={job1.id}'
         response = self.client.get(url)
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -286,13 +333,7 @@ class ComprehensiveForecastAPITest(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         
         # Test cancelling completed job (should fail)
-        completed_job = ForecastJob.objects.create(
-            portfolio=self.portfolio,
-            status='completed',
-            forecast_horizon=24
-        )
-        
-        url = f'/api/forecasts/jobs/{completed_job.id}/cancel/'
+        url = f'/api/forecasts/jobs/{self.completed_job.id}/cancel/'
         response = self.client.post(url)
         
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -300,76 +341,37 @@ class ComprehensiveForecastAPITest(TestCase):
         data = response.json()
         self.assertIn('Cannot cancel job', data['error'])
     
-    def test_api_response_formats(self):
-        """Test that API responses have correct formats and required fields."""
-        # Trigger a forecast
-        trigger_url = f'/api/forecasts/portfolio/{self.portfolio.id}/trigger/'
-        trigger_response = self.client.post(trigger_url, {'forecast_horizon': 6})
-        
-        job_id = trigger_response.json()['job_id']
-        
-        # Test trigger response format
-        trigger_data = trigger_response.json()
-        required_trigger_fields = [
-            'job_id', 'portfolio_id', 'portfolio_name', 'status', 
-            'created_at', 'message'
-        ]
-        
-        for field in required_trigger_fields:
-            self.assertIn(field, trigger_data)
-        
-        # Test job status response format
-        status_url = f'/api/forecasts/jobs/{job_id}/status/'
-        status_response = self.client.get(status_url)
-        status_data = status_response.json()
-        
-        required_status_fields = [
-            'job_id', 'portfolio_id', 'portfolio_name', 'status',
-            'created_at', 'completed_at', 'error_message', 'is_complete',
-            'is_successful', 'result_count', 'site_count', 'expected_results',
-            'results_complete', 'forecast_horizon'
-        ]
+    def test_trigger_response_format(self):
+        """Test that the trigger response has the required fields."""
+        response = self.client.post(self.trigger_url, {'forecast_horizon': 6})
         
-        for field in required_status_fields:
-            self.assertIn(field, status_data)
-        
-        # Test portfolio results response format
-        results_url = f'/api/forecasts/portfolio/{self.portfolio.id}/results/'
-        results_response = self.client.get(results_url)
-        results_data = results_response.json()
+        self.assertLessEqual(REQUIRED_FIELDS['trigger'], response.data.keys())
+    
+    def test_status_response_format(self):
+        """Test that the job status response has the required fields."""
+        response = self.client.get(f'/api/forecasts/jobs/{self.completed_job.id}/status/')
         
-        required_results_fields = [
-            'job_id', 'portfolio_id', 'portfolio_name', 'forecast_generated_at',
-            'site_count', 'total_capacity_mw', 'site_forecasts', 'portfolio_totals'
-        ]
+        self.assertLessEqual(REQUIRED_FIELDS['status'], response.data.keys())
+    
+    def test_portfolio_results_response_format(self):
+        """Test that the portfolio results response has the required fields."""
+        response = self.client.get(self.results_url)
         
-        for field in required_results_fields:
-            self.assertIn(field, results_data)
+        self.assertLessEqual(REQUIRED_FIELDS['portfolio_results'], response.data.keys())
+    
+    def test_site_forecast_format(self):
+        """Test that each site forecast and forecast point has the required fields."""
+        response = self.client.get(self.results_url)
         
-        # Test site forecast format
-        site_forecasts = results_data['site_forecasts']
+        site_forecasts = response.data['site_forecasts']
         self.assertGreater(len(site_forecasts), 0)
         
         site_forecast = site_forecasts[0]
-        required_site_fields = [
-            'site_id', 'site_name', 'site_type', 'capacity_mw', 'forecasts'
-        ]
-        
-        for field in required_site_fields:
-            self.assertIn(field, site_forecast)
+        self.assertLessEqual(REQUIRED_FIELDS['site_forecast'], site_forecast.keys())
         
-        # Test individual forecast format
         forecasts = site_forecast['forecasts']
         self.assertGreater(len(forecasts), 0)
-        
-        forecast = forecasts[0]
-        required_forecast_fields = [
-            'datetime', 'predicted_generation_mwh', 
-            'confidence_interval_lower', 'confidence_interval_upper'
-        ]
-        
-        for field in required_forecast_fields:
-            self.assertIn(field, forecast)
+        self.assertLessEqual(REQUIRED_FIELDS['forecast'], forecasts[0].keys())
     
     def test_error_response_consistency(self):
         """Test that error responses have consistent format."""
@@ -400,32 +402,29 @@ class ComprehensiveForecastAPITest(TestCase):
         """Test handling of concurrent forecast requests for same portfolio."""
         # Skip this test for SQLite as it doesn't handle concurrent writes well
         # In production, this would use PostgreSQL which handles concurrency better
-        from django.db import connection
         if 'sqlite' in connection.settings_dict['ENGINE']:
             self.skipTest("SQLite doesn't handle concurrent writes well in tests")
         
-        import threading
-        import time
-        
         results = []
         errors = []
+        url = self.trigger_url
+        
+        # Build one client per thread up front; test clients carry their own
+        # cookies and credentials, so a single client isn't shared
+        clients = [APIClient() for _ in range(3)]  # Reduced number for stability
         
-        def trigger_forecast():
+        def trigger_forecast(client):
             try:
-                # Use a separate client for each thread to avoid sharing connections
-                from rest_framework.test import APIClient
-                client = APIClient()
-                url = f'/api/forecasts/portfolio/{self.portfolio.id}/trigger/'
                 response = client.post(url, {'forecast_horizon': 6})  # Smaller horizon for faster tests
                 results.append(response.status_code)
             except Exception as e:
                 errors.append(str(e))
         
         # Create multiple threads to trigger forecasts simultaneously
-        threads = []
-        for _ in range(3):  # Reduced number for stability
-            thread = threading.Thread(target=trigger_forecast)
-            threads.append(thread)
+        threads = [
+            threading.Thread(target=trigger_forecast, args=(client,))
+            for client in clients
+        ]
         
         # Start all threads
         for thread in threads:
@@ -446,8 +445,7 @@ class ComprehensiveForecastAPITest(TestCase):
     def test_data_validation_and_consistency(self):
         """Test data validation and consistency across API responses."""
         # Trigger forecast
-        trigger_url = f'/api/forecasts/portfolio/{self.portfolio.id}/trigger/'
-        trigger_response = self.client.post(trigger_url, {'forecast_horizon': 24})
+        trigger_response = self.client.post(self.trigger_url, {'forecast_horizon': 24})
         
         job_id = trigger_response.json()['job_id']
         
@@ -457,8 +455,8 @@ class ComprehensiveForecastAPITest(TestCase):
         status_data = status_response.json()
         
         # Get portfolio results
-        results_url = f'/api/forecasts/portfolio/{self.portfolio.id}/results/'
-        results_response = self.client.get(results_url)
+        with self.assertNumQueries(PORTFOLIO_RESULTS_QUERIES):
+            results_response = self.client.get(self.results_url)
         results_data = results_response.json()
         
         # Validate data consistency
@@ -486,22 +484,13 @@ class ComprehensiveForecastAPITest(TestCase):
                 self.assertLessEqual(lower, predicted)
                 self.assertLessEqual(predicted, upper)
     
-    def _create_completed_job(self, portfolio, horizon):
-        """Helper method to create a completed forecast job with results."""
-        # Trigger a real forecast to get completed job with results
-        url = f'/api/forecasts/portfolio/{portfolio.id}/trigger/'
-        response = self.client.post(url, {'forecast_horizon': horizon})
-        
-        job_id = response.json()['job_id']
-        return ForecastJob.objects.get(id=job_id)
-    
     def test_service_error_handling(self):
         """Test API error handling when service layer fails."""
         with patch('forecasting.views.ForecastService.trigger_portfolio_forecast') as mock_trigger:
             # Mock service to raise an exception
             mock_trigger.side_effect = Exception("Service unavailable")
             
-            url = f'/api/forecasts/portfolio/{self.portfolio.id}/trigger/'
+            url = self.trigger_url
             response = self.client.post(url, {})
             
             self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -519,17 +508,17 @@ class ComprehensiveForecastAPITest(TestCase):
         )
         
         # Add 10 sites to the portfolio
-        sites = []
-        for i in range(10):
-            site = Site.objects.create(
+        sites = Site.objects.bulk_create([
+            Site(
                 name=f"Performance Test Site {i}",
                 site_type="solar" if i % 2 == 0 else "wind",
-                latitude=Decimal('40.0') + Decimal(str(i * 0.1)),
-                longitude=Decimal('-74.0') + Decimal(str(i * 0.1)),
+                latitude=Decimal('40.0') + offset,
+                longitude=Decimal('-74.0') + offset,
                 capacity_mw=Decimal('25.0')
             )
-            sites.append(site)
-            large_portfolio.sites.add(site)
+            for i, offset in enumerate(LARGE_PORTFOLIO_OFFSETS)
+        ])
+        large_portfolio.sites.add(*sites)
         
         # Trigger forecast for large portfolio
         url = f'/api/forecasts/portfolio/{large_portfolio.id}/trigger/'
@@ -10,7 +10,7 @@ from datetime import datetime, timedelta
 from decimal import Decimal
 from unittest.mock import Mock, patch
 
-from django.test import TestCase
+from django.test import SimpleTestCase
 from django.utils import timezone
 
 from .forecast_engine import (
@@ -26,9 +26,10 @@ from .models import Site
 class MockForecastModel(ForecastModel):
     """Mock implementation of ForecastModel for testing."""
     
-    def predict(self, site, forecast_horizon: int = 24):
+    def predict(self, site, forecast_horizon: int = 24, start_time=None):
         """Return mock predictions."""
-        start_time = timezone.now().replace(minute=0, second=0, microsecond=0)
+        if start_time is None:
+            start_time = timezone.now().replace(minute=0, second=0, microsecond=0)
         return [
             ForecastPoint(
                 datetime=start_time + timedelta(hours=i),
@@ -44,7 +45,7 @@ class MockForecastModel(ForecastModel):
         return "Mock Model v1.0"
 
 
-class ForecastPointTest(TestCase):
+class ForecastPointTest(SimpleTestCase):
     """Test the ForecastPoint NamedTuple."""
     
     def test_forecast_point_creation(self):
@@ -76,7 +77,7 @@ class ForecastPointTest(TestCase):
         self.assertIsNone(point.confidence_interval_upper)
 
 
-class ForecastModelTest(TestCase):
+class ForecastModelTest(SimpleTestCase):
     """Test the abstract ForecastModel base class."""
     
     def test_abstract_methods(self):
@@ -96,7 +97,7 @@ class ForecastModelTest(TestCase):
         self.assertIn("Mock Model v1.0", model.get_model_description())
 
 
-class RandomForecastModelTest(TestCase):
+class RandomForecastModelTest(SimpleTestCase):
     """Test the RandomForecastModel implementation."""
     
     def setUp(self):
@@ -246,6 +247,21 @@ class RandomForecastModelTest(TestCase):
         for point in predictions:
             self.assertIsInstance(point.predicted_generation_mwh, Decimal)
     
+    def test_predict_with_start_time(self):
+        """Test that predictions start at a caller-provided start time."""
+        model = RandomForecastModel(seed=42)
+        start_time = timezone.now().replace(hour=3, minute=0, second=0, microsecond=0)
+        
+        predictions = model.predict(self.solar_site, forecast_horizon=4, start_time=start_time)
+        
+        self.assertEqual(
+            [point.datetime for point in predictions],
+            [start_time + timedelta(hours=i) for i in range(4)]
+        )
+        # 3 AM - 6 AM is night time for solar
+        for point in predictions:
+            self.assertEqual(point.predicted_generation_mwh, Decimal('0'))
+    
     def test_reproducible_predictions(self):
         """Test that predictions are reproducible with same seed."""
         model1 = RandomForecastModel(seed=123)
@@ -261,7 +277,7 @@ class RandomForecastModelTest(TestCase):
             self.assertEqual(p1.confidence_interval_upper, p2.confidence_interval_upper)
 
 
-class ModelRegistryTest(TestCase):
+class ModelRegistryTest(SimpleTestCase):
     """Test the ModelRegistry functionality."""
     
     def setUp(self):
@@ -315,6 +331,13 @@ class ModelRegistryTest(TestCase):
         self.assertEqual(model, self.registry._default_model)
         self.assertIsInstance(model, RandomForecastModel)
     
+    def test_registered_site_types_copy(self):
+        """Test that changing the returned site types doesn't affect the registry."""
+        site_types = self.registry.get_registered_site_types()
+        site_types.append('hydro')
+        
+        self.assertNotIn('hydro', self.registry.get_registered_site_types())
+    
     def test_unregister_model(self):
         """Test unregistering a model."""
         # Register a model first
@@ -347,7 +370,7 @@ class ModelRegistryTest(TestCase):
             self.registry.set_default_model("not a model")
 
 
-class GlobalModelRegistryTest(TestCase):
+class GlobalModelRegistryTest(SimpleTestCase):
     """Test the global model registry instance."""
     
     def test_global_registry_exists(self):
@@ -10,7 +10,8 @@ from datetime import datetime, timedelta
 from decimal import Decimal
 from unittest.mock import Mock, patch, MagicMock
 
-from django.test import TestCase
+from django.core.cache import cache, caches
+from django.test import TestCase, override_settings
 from django.utils import timezone
 from django.db import transaction
 
@@ -20,7 +21,8 @@ from .services import (
     ForecastServiceError,
     PortfolioNotFoundError,
     EmptyPortfolioError,
-    JobNotFoundError
+    JobNotFoundError,
+    _prediction_cache
 )
 from .forecast_engine import RandomForecastModel, ForecastPoint
 
@@ -96,8 +98,8 @@ class ForecastServiceTest(TestCase):
         
         # Verify result data structure
         for result in results:
-            self.assertIsInstance(result.predicted_generation_mwh, Decimal)
-            self.assertGreaterEqual(result.predicted_generation_mwh, Decimal('0'))
+            self.assertIsInstance(result.predicted_generation_mwh, float)
+            self.assertGreaterEqual(result.predicted_generation_mwh, 0.0)
             self.assertIsNotNone(result.forecast_datetime)
             self.assertIsNotNone(result.confidence_interval_lower)
             self.assertIsNotNone(result.confidence_interval_upper)
@@ -180,6 +182,45 @@ class ForecastServiceTest(TestCase):
         with self.assertRaises(JobNotFoundError):
             self.service.get_forecast_status(fake_job_id)
     
+    def test_get_forecast_status_cached_when_complete(self):
+        """Test that status of a finished job is served from the cache."""
+        job = self.service.trigger_portfolio_forecast(self.portfolio_with_sites.id)
+        status = self.service.get_forecast_status(job.id)
+        
+        with self.assertNumQueries(0):
+            self.assertEqual(self.service.get_forecast_status(job.id), status)
+    
+    def test_get_forecast_status_served_from_process_cache(self):
+        """Test that finished job status survives an empty shared cache."""
+        job = self.service.trigger_portfolio_forecast(self.portfolio_with_sites.id)
+        status = self.service.get_forecast_status(job.id)
+        cache.clear()
+        
+        with self.assertNumQueries(0):
+            self.assertEqual(self.service.get_forecast_status(job.id), status)
+    
+    def test_get_forecast_status_single_query(self):
+        """Test that uncached status of a finished job is read in one query."""
+        job = self.service.trigger_portfolio_forecast(self.portfolio_with_sites.id)
+        cache.clear()
+        caches['forecast_l1'].clear()
+        
+        with self.assertNumQueries(1):
+            status = self.service.get_forecast_status(job.id)
+        
+        self.assertEqual(status['site_count'], self.portfolio_with_sites.sites.count())
+        self.assertEqual(status['result_count'], job.results.count())
+        self.assertTrue(status['results_complete'])
+    
+    def test_get_forecast_status_not_cached_while_pending(self):
+        """Test that status of an unfinished job is always read from the database."""
+        job = ForecastJob.objects.create(portfolio=self.portfolio_with_sites)
+        self.assertEqual(self.service.get_forecast_status(job.id)['status'], 'pending')
+        
+        ForecastJob.objects.filter(id=job.id).update(status='running')
+        
+        self.assertEqual(self.service.get_forecast_status(job.id)['status'], 'running')
+    
     def test_get_portfolio_forecast_results_success(self):
         """Test getting portfolio forecast results."""
         # Create forecast job and results
@@ -223,6 +264,32 @@ class ForecastServiceTest(TestCase):
             self.assertIn('total_confidence_lower', total)
             self.assertIn('total_confidence_upper', total)
     
+    def test_get_portfolio_forecast_results_cached(self):
+        """Test that repeat result requests only look up the job and its portfolio."""
+        job = self.service.trigger_portfolio_forecast(self.portfolio_with_sites.id)
+        results = self.service.get_portfolio_forecast_results(self.portfolio_with_sites.id)
+        
+        with self.assertNumQueries(1):
+            cached = self.service.get_portfolio_forecast_results(
+                self.portfolio_with_sites.id, job_id=job.id
+            )
+        
+        self.assertEqual(cached, results)
+    
+    def test_get_portfolio_forecast_results_cached_portfolio_fields_current(self):
+        """Test that cached results report the portfolio's current name and capacity."""
+        self.service.trigger_portfolio_forecast(self.portfolio_with_sites.id)
+        self.service.get_portfolio_forecast_results(self.portfolio_with_sites.id)
+        
+        Portfolio.objects.filter(id=self.portfolio_with_sites.id).update(name="Renamed Portfolio")
+        self.portfolio_with_sites.sites.remove(self.wind_site)
+        
+        results = self.service.get_portfolio_forecast_results(self.portfolio_with_sites.id)
+        
+        self.assertEqual(results['portfolio_name'], "Renamed Portfolio")
+        self.assertEqual(results['total_capacity_mw'], 50.0)
+        self.assertEqual(results['site_count'], 2)
+    
     def test_get_portfolio_forecast_results_specific_job(self):
         """Test getting results for a specific job ID."""
         # Create two jobs
@@ -352,6 +419,37 @@ class ForecastServiceTest(TestCase):
         
         # Check that recent job still exists
         self.assertTrue(ForecastJob.objects.filter(id=recent_job.id).exists())
+        
+        # Results of the old jobs are removed with them
+        self.assertFalse(ForecastResult.objects.filter(job_id__in=[old_job1.id, old_job2.id]).exists())
+        self.assertTrue(ForecastResult.objects.filter(job=recent_job).exists())
+    
+    def test_cleanup_old_jobs_evicts_cached_responses(self):
+        """Test that cleaned up jobs are no longer served from the cache."""
+        with patch('django.utils.timezone.now', return_value=timezone.now() - timedelta(days=35)):
+            old_job = self.service.trigger_portfolio_forecast(self.portfolio_with_sites.id)
+        self.service.get_forecast_status(old_job.id)
+        self.service.get_portfolio_forecast_results(self.portfolio_with_sites.id, job_id=old_job.id)
+        
+        self.service.cleanup_old_jobs(days_old=30)
+        
+        with self.assertRaises(JobNotFoundError):
+            self.service.get_forecast_status(old_job.id)
+        with self.assertRaises(JobNotFoundError):
+            self.service.get_portfolio_forecast_results(
+                self.portfolio_with_sites.id, job_id=old_job.id
+            )
+    
+    def test_delete_portfolio_evicts_cached_responses(self):
+        """Test that jobs deleted with their portfolio are no longer served from the cache."""
+        job = self.service.trigger_portfolio_forecast(self.portfolio_with_sites.id)
+        self.service.get_forecast_status(job.id)
+        
+        self.service.delete_portfolio(self.portfolio_with_sites)
+        
+        self.assertFalse(Portfolio.objects.filter(id=self.portfolio_with_sites.id).exists())
+        with self.assertRaises(JobNotFoundError):
+            self.service.get_forecast_status(job.id)
     
     def test_process_forecast_job_error_handling(self):
         """Test error handling in forecast job processing."""
@@ -392,6 +490,133 @@ class ForecastServiceTest(TestCase):
         job.refresh_from_db()
         self.assertEqual(job.status, 'failed')
         self.assertIn("Portfolio has no sites", job.error_message)
+    
+    @override_settings(FORECAST_ASYNC_JOBS=True)
+    @patch('forecasting.tasks.run_portfolio_forecast')
+    def test_trigger_portfolio_forecast_async(self, mock_task):
+        """Test that async mode queues the job instead of processing it."""
+        with self.captureOnCommitCallbacks(execute=True):
+            job = self.service.trigger_portfolio_forecast(self.portfolio_with_sites.id)
+        
+        self.assertEqual(job.status, 'pending')
+        self.assertFalse(ForecastResult.objects.filter(job=job).exists())
+        mock_task.delay.assert_called_once_with(str(job.id))
+    
+    @override_settings(FORECAST_ASYNC_JOBS=True)
+    @patch('forecasting.tasks.run_portfolio_forecast', new=lambda job_id: None)
+    def test_trigger_portfolio_forecast_async_without_celery(self):
+        """Test that async mode without Celery leaves no orphaned pending job."""
+        with self.assertRaises(ForecastServiceError):
+            self.service.trigger_portfolio_forecast(self.portfolio_with_sites.id)
+        
+        self.assertFalse(ForecastJob.objects.filter(portfolio=self.portfolio_with_sites).exists())
+    
+    def test_run_forecast_job_pending(self):
+        """Test that a worker run processes a pending job."""
+        job = ForecastJob.objects.create(
+            portfolio=self.portfolio_with_sites,
+            status='pending',
+            forecast_horizon=6
+        )
+        
+        self.service.run_forecast_job(job.id)
+        
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'completed')
+        self.assertEqual(ForecastResult.objects.filter(job=job).count(), 2 * 6)
+    
+    def test_deterministic_model_predictions_reused(self):
+        """Test that deterministic model output is reused across jobs."""
+        _prediction_cache.clear()
+        self.addCleanup(_prediction_cache.clear)
+        
+        model = RandomForecastModel(seed=42)
+        model.deterministic = True
+        fixed_now = timezone.now()
+        
+        with patch('forecasting.services.model_registry.get_model', return_value=model), \
+             patch.object(model, 'predict', wraps=model.predict) as mock_predict, \
+             patch('forecasting.services.timezone.now', return_value=fixed_now):
+            first_job = self.service.trigger_portfolio_forecast(self.portfolio_with_sites.id)
+            second_job = self.service.trigger_portfolio_forecast(self.portfolio_with_sites.id)
+        
+        # One predict call per site, all made by the first job
+        self.assertEqual(mock_predict.call_count, 2)
+        
+        fields = ('site_id', 'forecast_datetime', 'predicted_generation_mwh')
+        self.assertEqual(
+            list(ForecastResult.objects.filter(job=first_job).order_by('site_id', 'forecast_datetime').values_list(*fields)),
+            list(ForecastResult.objects.filter(job=second_job).order_by('site_id', 'forecast_datetime').values_list(*fields))
+        )
+    
+    def test_deterministic_model_predictions_follow_moved_site(self):
+        """Test that moving a site invalidates its reused predictions."""
+        _prediction_cache.clear()
+        self.addCleanup(_prediction_cache.clear)
+        
+        model = RandomForecastModel(seed=42)
+        model.deterministic = True
+        fixed_now = timezone.now()
+        
+        with patch('forecasting.services.model_registry.get_model', return_value=model), \
+             patch.object(model, 'predict', wraps=model.predict) as mock_predict, \
+             patch('forecasting.services.timezone.now', return_value=fixed_now):
+            self.service.trigger_portfolio_forecast(self.portfolio_with_sites.id)
+            Site.objects.filter(id=self.solar_site.id).update(latitude=Decimal('35.0000'))
+            self.service.trigger_portfolio_forecast(self.portfolio_with_sites.id)
+        
+        # The moved site is predicted again; the other site's output is reused
+        self.assertEqual(mock_predict.call_count, 3)
+    
+    def test_run_forecast_job_skips_cancelled(self):
+        """Test that a worker run skips jobs cancelled while queued."""
+        job = ForecastJob.objects.create(
+            portfolio=self.portfolio_with_sites,
+            status='pending',
+            forecast_horizon=6
+        )
+        self.service.cancel_forecast_job(job.id)
+        
+        self.service.run_forecast_job(job.id)
+        
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'failed')
+        self.assertFalse(ForecastResult.objects.filter(job=job).exists())
+    
+    def test_cancel_while_running_keeps_job_cancelled(self):
+        """Test that a job cancelled mid-run is not completed afterwards."""
+        job = ForecastJob.objects.create(
+            portfolio=self.portfolio_with_sites,
+            status='pending',
+            forecast_horizon=6
+        )
+        generate = self.service._generate_site_results
+        
+        def cancel_then_generate(*args):
+            self.service.cancel_forecast_job(job.id)
+            return generate(*args)
+        
+        with patch.object(self.service, '_generate_site_results', side_effect=cancel_then_generate):
+            self.service.run_forecast_job(job.id)
+        
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'failed')
+        self.assertEqual(job.error_message, 'Job cancelled by user')
+        self.assertFalse(ForecastResult.objects.filter(job=job).exists())
+    
+    def test_run_forecast_job_skips_claimed(self):
+        """Test that a redelivered task leaves a job another worker claimed alone."""
+        job = ForecastJob.objects.create(
+            portfolio=self.portfolio_with_sites,
+            status='running',
+            forecast_horizon=6
+        )
+        
+        self.service.run_forecast_job(job.id)
+        
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'running')
+        self.assertFalse(ForecastResult.objects.filter(job=job).exists())
 
 
 class ForecastServiceIntegrationTest(TestCase):
@@ -0,0 +1,45 @@
+"""
+Shared fixtures for forecast API tests.
+"""
+
+from datetime import timedelta
+from django.utils import timezone
+
+from .models import ForecastJob, ForecastResult
+
+
+def create_completed_job(portfolio, horizon):
+    """
+    Create a completed forecast job with synthetic results for each site.
+    
+    The job and its results are inserted directly, so tests that only read
+    them back don't run the forecast engine.
+    
+    Args:
+        portfolio: Portfolio the job belongs to
+        horizon: Number of hourly results per site
+        
+    Returns:
+        The completed ForecastJob
+    """
+    completed_at = timezone.now()
+    start_time = completed_at.replace(minute=0, second=0, microsecond=0)
+    job = ForecastJob.objects.create(
+        portfolio=portfolio,
+        status='completed',
+        forecast_horizon=horizon,
+        completed_at=completed_at
+    )
+    ForecastResult.objects.bulk_create([
+        ForecastResult(
+            job=job,
+            site=site,
+            forecast_datetime=start_time + timedelta(hours=hour),
+            predicted_generation_mwh=10.0,
+            confidence_interval_lower=8.0,
+            confidence_interval_upper=12.0
+        )
+        for site in portfolio.sites.all()
+        for hour in range(horizon)
+    ])
+    return job
\ No newline at end of file
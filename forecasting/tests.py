@@ -1,7 +1,10 @@
+import time
+from django.contrib.auth import get_user_model
 from django.test import TestCase
 from django.core.exceptions import ValidationError
 from decimal import Decimal
 from .models import Site, Portfolio, PortfolioSite, ForecastJob, ForecastResult
+from .paginators import EstimatedCountPaginator
 
 
 class SiteModelTest(TestCase):
@@ -96,6 +99,31 @@ class PortfolioModelTest(TestCase):
         self.assertEqual(portfolio.get_site_count(), 2)
         self.assertEqual(portfolio.get_total_capacity(), Decimal('250.0'))
     
+    def test_portfolio_capacity_stats_single_query(self):
+        """Test that site count and total capacity share one aggregate query."""
+        portfolio = Portfolio.objects.create(name="Test Portfolio")
+        portfolio.sites.add(self.site1, self.site2)
+        
+        with self.assertNumQueries(1):
+            self.assertEqual(portfolio.get_site_count(), 2)
+            self.assertEqual(portfolio.get_total_capacity(), Decimal('250.0'))
+    
+    def test_portfolio_capacity_stats_follow_site_changes(self):
+        """Test that site count and total capacity update after sites change."""
+        portfolio = Portfolio.objects.create(name="Test Portfolio")
+        portfolio.sites.add(self.site1)
+        self.assertEqual(portfolio.get_site_count(), 1)
+        
+        portfolio.sites.add(self.site2)
+        self.assertEqual(portfolio.get_site_count(), 2)
+        self.assertEqual(portfolio.get_total_capacity(), Decimal('250.0'))
+        
+        portfolio.sites.remove(self.site1)
+        self.assertEqual(portfolio.get_site_count(), 1)
+        
+        portfolio.sites.clear()
+        self.assertEqual(portfolio.get_site_count(), 0)
+    
     def test_unique_portfolio_site(self):
         """Test that a site can't be added to the same portfolio twice."""
         portfolio = Portfolio.objects.create(name="Test Portfolio")
@@ -120,6 +148,15 @@ class ForecastJobModelTest(TestCase):
         self.assertFalse(job.is_complete())
         self.assertFalse(job.is_successful())
     
+    def test_job_ids_are_time_ordered(self):
+        """Test that job IDs are version 7 UUIDs that sort by creation time."""
+        first = ForecastJob.objects.create(portfolio=self.portfolio)
+        time.sleep(0.002)
+        second = ForecastJob.objects.create(portfolio=self.portfolio)
+        
+        self.assertEqual(first.id.version, 7)
+        self.assertLess(first.id, second.id)
+    
     def test_job_status_methods(self):
         """Test job status helper methods."""
         job = ForecastJob.objects.create(portfolio=self.portfolio)
@@ -156,14 +193,15 @@ class ForecastResultModelTest(TestCase):
             job=self.job,
             site=self.site,
             forecast_datetime=timezone.now(),
-            predicted_generation_mwh=Decimal('50.123'),
-            confidence_interval_lower=Decimal('45.000'),
-            confidence_interval_upper=Decimal('55.000')
+            predicted_generation_mwh=50.123,
+            confidence_interval_lower=45.0,
+            confidence_interval_upper=55.0
         )
         
+        result.refresh_from_db()
         self.assertEqual(result.job, self.job)
         self.assertEqual(result.site, self.site)
-        self.assertEqual(result.predicted_generation_mwh, Decimal('50.123'))
+        self.assertEqual(result.predicted_generation_mwh, 50.123)
     
     def test_confidence_interval_validation(self):
         """Test that confidence intervals are validated."""
@@ -753,6 +791,24 @@ class PortfolioAPITestCase(APITestCase):
             self.assertEqual(len(response.data), 1)
             self.assertEqual(response.data[0]['name'], 'Existing Portfolio')
     
+    def test_list_portfolios_api_query_count(self):
+        """Test that listing portfolios does not query per portfolio."""
+        # Created in reverse name order so the sorted check below depends on ordering
+        for i in reversed(range(3)):
+            portfolio = Portfolio.objects.create(name=f'Extra Portfolio {i}')
+            portfolio.sites.add(self.site1, self.site2)
+        
+        # Page count, portfolio page and one sites prefetch, whatever the page size
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/portfolios/')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        names = [p['name'] for p in response.data['results']]
+        self.assertEqual(names, sorted(names))
+        extra = next(p for p in response.data['results'] if p['name'] == 'Extra Portfolio 0')
+        self.assertEqual(extra['site_count'], 2)
+        self.assertEqual(Decimal(str(extra['total_capacity'])), Decimal('250.00'))
+    
     def test_retrieve_portfolio_api(self):
         """Test retrieving a specific portfolio via API."""
         url = f'/api/portfolios/{self.portfolio.id}/'
@@ -984,4 +1040,47 @@ class PortfolioAPITestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         # Should only count site1's capacity
         self.assertEqual(Decimal(str(response.data['total_capacity'])), self.site1.capacity_mw)
-        self.assertEqual(response.data['site_count'], 2)
\ No newline at end of file
+        self.assertEqual(response.data['site_count'], 2)
+
+
+class EstimatedCountPaginatorTestCase(TestCase):
+    """Test cases for the admin paginator that estimates large table sizes."""
+    
+    @classmethod
+    def setUpTestData(cls):
+        """Create jobs in two states and an admin user to list them."""
+        portfolio = Portfolio.objects.create(name="Paginated Portfolio")
+        ForecastJob.objects.bulk_create([
+            ForecastJob(portfolio=portfolio, status='completed'),
+            ForecastJob(portfolio=portfolio, status='completed'),
+            ForecastJob(portfolio=portfolio, status='failed'),
+        ])
+        cls.admin_user = get_user_model().objects.create_superuser(
+            'admin', 'admin@example.com', 'password'
+        )
+    
+    def test_count_exact_without_estimate(self):
+        """Test that the exact count is used where no estimate is available."""
+        paginator = EstimatedCountPaginator(ForecastJob.objects.order_by('-created_at'), 100)
+        
+        self.assertEqual(paginator.count, 3)
+        self.assertEqual(paginator.num_pages, 1)
+    
+    def test_filtered_count_exact(self):
+        """Test that filtered querysets are counted exactly."""
+        paginator = EstimatedCountPaginator(
+            ForecastJob.objects.filter(status='completed').order_by('-created_at'), 100
+        )
+        
+        self.assertEqual(paginator.count, 2)
+    
+    def test_changelist_reports_real_count(self):
+        """Test that job changelists report the real number of jobs."""
+        self.client.force_login(self.admin_user)
+        
+        for query, expected in [('', '3 forecast jobs'), ('?status__exact=completed', '2 forecast jobs')]:
+            with self.subTest(query=query):
+                response = self.client.get(f'/admin/forecasting/forecastjob/{query}')
+                
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertContains(response, expected)
\ No newline at end of file
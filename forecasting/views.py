@@ -4,6 +4,7 @@ from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
 from rest_framework.exceptions import ValidationError
 from django.db import transaction, IntegrityError
+from django.db.models import Count, Prefetch, Sum
 from django.core.exceptions import ValidationError as DjangoValidationError
 from django.http import Http404
 from .models import Site, Portfolio, PortfolioSite, ForecastJob, ForecastResult
@@ -277,7 +278,16 @@ class PortfolioViewSet(viewsets.ModelViewSet):
     
     Provides CRUD operations for portfolios with nested site management.
     """
-    queryset = Portfolio.objects.prefetch_related('sites').all()
+    # Site count and capacity are annotated so serializing a page runs no per-row
+    # queries; the sites prefetch loads only the columns the nested serializer renders.
+    # The aggregate makes this a GROUP BY query, which drops Meta.ordering, so the
+    # ordering is restated to keep pages stable
+    queryset = Portfolio.objects.prefetch_related(
+        Prefetch('sites', queryset=Site.objects.only(*SiteSerializer.Meta.fields))
+    ).annotate(
+        _site_count=Count('sites'),
+        _total_capacity=Sum('sites__capacity_mw')
+    ).order_by('name')
     serializer_class = PortfolioSerializer
     permission_classes = [AllowAny]
     
@@ -346,6 +356,10 @@ class PortfolioViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
     
+    def perform_destroy(self, instance):
+        """Delete the portfolio through the service so cached job responses go with it."""
+        ForecastService().delete_portfolio(instance)
+    
     @action(detail=True, methods=['post'])
     def add_site(self, request, pk=None):
         """Add a site to the portfolio."""
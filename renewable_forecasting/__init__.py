@@ -0,0 +1,8 @@
+# Load the Celery app when Django starts so shared tasks bind to it.
+# Celery is optional; without it forecast jobs run in-process.
+try:
+    from .celery import app as celery_app
+except ImportError:
+    celery_app = None
+
+__all__ = ['celery_app']
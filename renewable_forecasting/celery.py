@@ -0,0 +1,22 @@
+"""
+Celery application for renewable_forecasting.
+
+Used to process forecast jobs in background workers when
+FORECAST_ASYNC_JOBS is enabled. Start a worker with:
+
+    celery -A renewable_forecasting worker -Q forecast
+"""
+
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'renewable_forecasting.settings')
+
+app = Celery('renewable_forecasting')
+
+# Read CELERY_* settings from Django settings
+app.config_from_object('django.conf:settings', namespace='CELERY')
+
+# Load tasks.py modules from all installed apps
+app.autodiscover_tasks()
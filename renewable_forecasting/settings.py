@@ -90,10 +90,36 @@ DATABASES = {
         'PASSWORD': config('DB_PASSWORD', default=''),
         'HOST': config('DB_HOST', default=''),
         'PORT': config('DB_PORT', default=''),
+        # Test database name; set a file path for SQLite so `manage.py test
+        # --keepdb` can reuse the migrated schema (the default is in-memory)
+        'TEST': {
+            'NAME': config('DB_TEST_NAME', default=None),
+        },
     }
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/4.2/ref/settings/#caches
+# Set CACHE_BACKEND=django.core.cache.backends.redis.RedisCache and
+# CACHE_LOCATION=redis://... (requires the ``redis`` package) to share cached
+# forecast responses across workers. ``forecast_l1`` is a small per-process
+# cache in front of it for hot status polls.
+
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default=''),
+    },
+    'forecast_l1': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'forecast-l1',
+        'TIMEOUT': 60,
+        'OPTIONS': {'MAX_ENTRIES': 1024},
+    },
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -153,6 +179,18 @@ REST_FRAMEWORK = {
 }
 
 
+# Forecast job processing
+# When enabled, forecast jobs are queued to Celery workers instead of being
+# processed inside the request. Requires the ``celery`` package and a broker.
+FORECAST_ASYNC_JOBS = config('FORECAST_ASYNC_JOBS', default=False, cast=bool)
+
+CELERY_BROKER_URL = config('CELERY_BROKER_URL', default='redis://localhost:6379/0')
+CELERY_TASK_DEFAULT_QUEUE = 'forecast'
+# Forecast jobs are long-running, so a worker reserves one at a time instead
+# of holding a batch that idle workers could have picked up
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+
+
 # CORS Configuration
 CORS_ALLOWED_ORIGINS = config(
     'CORS_ALLOWED_ORIGINS',